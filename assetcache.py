@@ -0,0 +1,251 @@
+"""Pre-scaled image cache, so launches skip PNG decoding and rescaling.
+
+One file holds every image AssetManager has scaled, as raw pixels:
+
+    magic    4 bytes  b"LFAC"
+    version  uint16   CACHE_VERSION the file was written with
+    length   uint32   size of the JSON index that follows
+
+After the index comes the pixel data. Small images (plant sprites, icons)
+are packed into one RGBA atlas; larger ones (backgrounds) each get their own
+run. The file is read through mmap and each image becomes one frombuffer
+call. Every entry records its source file's mtime, size and CRC32, so only
+images whose source changed are decoded again.
+
+Build it ahead of time with `python assetcache.py`; the game also fills it
+in as it loads.
+"""
+import io
+import json
+import mmap
+import os
+import struct
+import zlib
+import pygame
+from savefile import write_atomic
+
+CACHE_MAGIC = b"LFAC"
+CACHE_VERSION = 1
+HEADER = struct.Struct(">4sHI")
+ATLAS_MAX_SIDE = 64  # Images up to this size go into the atlas
+ATLAS_WIDTH = 512
+
+
+def entry_key(file_name, size, alpha):
+    w, h = size or (0, 0)
+    return f"{file_name}|{w}x{h}|{'rgba' if alpha else 'rgb'}"
+
+
+def source_stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def pack_atlas(sizes):
+    """Shelf-packs (w, h) sizes into ATLAS_WIDTH columns. Returns positions and the atlas size."""
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    positions = [None] * len(sizes)
+    x = y = shelf_h = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > ATLAS_WIDTH:
+            x, y, shelf_h = 0, y + shelf_h, 0
+        positions[i] = (x, y)
+        x += w
+        shelf_h = max(shelf_h, h)
+    return positions, (ATLAS_WIDTH, max(1, y + shelf_h))
+
+
+class AssetCache:
+    """The cache file plus entries added since it was read. Not thread-safe; AssetManager's worker owns it."""
+
+    def __init__(self, path, assets_dir):
+        self.path = path
+        self.assets_dir = assets_dir
+        self.entries = {}
+        self.new_pixels = {}  # key -> bytes for entries not in the file yet
+        self.dirty = False
+        self.map = None
+        self.data_start = 0
+        self.atlas = None
+        self.open()
+
+    def open(self):
+        self.entries = {}
+        self.atlas = None
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as f:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, length = HEADER.unpack_from(self.map)
+            if magic != CACHE_MAGIC or version != CACHE_VERSION:
+                raise ValueError("not a current asset cache")
+            index = json.loads(self.map[HEADER.size:HEADER.size + length].decode("utf-8"))
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Ignoring asset cache: {e}")
+            self.close()
+            return
+        self.data_start = HEADER.size + length
+        self.entries = index["entries"]
+        if index["atlas"]:
+            offset, (w, h) = index["atlas"]
+            self.atlas = pygame.image.frombuffer(self.read(offset, w * h * 4), (w, h), "RGBA")
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+    def read(self, offset, length):
+        start = self.data_start + offset
+        return self.map[start:start + length]
+
+    def is_fresh(self, entry, path):
+        """Whether the source still matches; a touched but unchanged file only has its stamp updated."""
+        try:
+            stamp = source_stamp(path)
+        except OSError:
+            return False
+        if list(stamp) == entry["stamp"]:
+            return True
+        with open(path, "rb") as f:
+            if zlib.crc32(f.read()) != entry["crc"]:
+                return False
+        entry["stamp"] = list(stamp)
+        self.dirty = True
+        return True
+
+    def get(self, file_name, size, alpha):
+        """The cached surface (not yet converted), or None if it is missing or stale."""
+        key = entry_key(file_name, size, alpha)
+        entry = self.entries.get(key)
+        if entry is None or not self.is_fresh(entry, os.path.join(self.assets_dir, file_name)):
+            return None
+
+        w, h = entry["size"]
+        if key in self.new_pixels:
+            return pygame.image.frombuffer(self.new_pixels[key], (w, h), entry["format"])
+        if "atlas" in entry:
+            return self.atlas.subsurface((*entry["atlas"], w, h))
+        return pygame.image.frombuffer(self.read(entry["offset"], len(entry["format"]) * w * h),
+                                       (w, h), entry["format"])
+
+    def load(self, file_name, size, alpha):
+        """Decodes and scales the source, adding it to the cache. None if it is missing or unreadable."""
+        path = os.path.join(self.assets_dir, file_name)
+        try:
+            stamp = source_stamp(path)
+            with open(path, "rb") as f:
+                blob = f.read()
+            img = pygame.image.load(io.BytesIO(blob), file_name)
+            if size:
+                img = pygame.transform.scale(img, size)
+        except (pygame.error, OSError):
+            return None
+
+        fmt = "RGBA" if alpha else "RGB"
+        key = entry_key(file_name, size, alpha)
+        self.entries[key] = {"file": file_name, "stamp": list(stamp), "crc": zlib.crc32(blob),
+                             "size": list(img.get_size()), "format": fmt}
+        self.new_pixels[key] = pygame.image.tobytes(img, fmt)
+        self.dirty = True
+        return img
+
+    def save(self):
+        """Rewrites the file with every entry whose source still exists, repacking the atlas.
+
+        The new index is built on copies and only replaces `entries` once the file is written, so a
+        failed write leaves the cache reading the old file as before.
+        """
+        entries = {k: dict(e) for k, e in self.entries.items()
+                   if os.path.exists(os.path.join(self.assets_dir, e["file"]))}
+        pixels = {}
+        for key, entry in entries.items():
+            if key in self.new_pixels:
+                pixels[key] = self.new_pixels[key]
+            elif "atlas" in entry:
+                pixels[key] = pygame.image.tobytes(self.get_atlas_image(entry), "RGBA")
+            else:
+                w, h = entry["size"]
+                pixels[key] = self.read(entry["offset"], len(entry["format"]) * w * h)
+
+        small = [k for k, e in entries.items()
+                 if e["format"] == "RGBA" and max(e["size"]) <= ATLAS_MAX_SIDE]
+        in_atlas = set(small)
+        positions, atlas_size = pack_atlas([entries[k]["size"] for k in small])
+        atlas = pygame.Surface(atlas_size, pygame.SRCALPHA, 32)
+        for key, pos in zip(small, positions):
+            entry = entries[key]
+            # MAX onto the cleared atlas copies pixels exactly; a normal blit would blend the alpha
+            atlas.blit(pygame.image.frombuffer(pixels[key], entry["size"], "RGBA"), pos,
+                       special_flags=pygame.BLEND_RGBA_MAX)
+            entry.pop("offset", None)
+            entry["atlas"] = list(pos)
+
+        chunks = []
+        offset = 0
+        if small:
+            chunks.append(pygame.image.tobytes(atlas, "RGBA"))
+            offset = len(chunks[0])
+        for key, entry in entries.items():
+            if key in in_atlas:
+                continue
+            entry.pop("atlas", None)
+            entry["offset"] = offset
+            chunks.append(pixels[key])
+            offset += len(pixels[key])
+
+        index = json.dumps({"atlas": [0, list(atlas_size)] if small else None, "entries": entries},
+                           separators=(",", ":")).encode("utf-8")
+        self.close()  # Windows cannot replace a mapped file
+        try:
+            write_atomic(self.path, HEADER.pack(CACHE_MAGIC, CACHE_VERSION, len(index)) + index + b"".join(chunks))
+        except OSError:
+            self.remap()
+            raise
+        self.new_pixels = {}
+        self.dirty = False
+        self.open()
+
+    def remap(self):
+        """Maps the old file again after a failed save; write_atomic leaves it untouched."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as f:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError as e:
+            # Without the file only the unsaved entries can still be read; the rest load from source again
+            print(f"Ignoring asset cache: {e}")
+            self.entries = {k: e for k, e in self.entries.items() if k in self.new_pixels}
+            self.atlas = None
+
+    def get_atlas_image(self, entry):
+        w, h = entry["size"]
+        return self.atlas.subsurface((*entry["atlas"], w, h))
+
+
+def main(argv=None):
+    import argparse
+    import time
+    from settings import ASSETS_DIR, ASSET_CACHE_FILE
+    from main import Game
+
+    parser = argparse.ArgumentParser(description="Pre-scale the game's images into the asset cache.")
+    parser.add_argument("--out", default=ASSET_CACHE_FILE, help="cache file to build")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    cache = AssetCache(args.out, ASSETS_DIR)
+    built = 0
+    for file_name, size, alpha in Game.get_asset_manifest():
+        if cache.get(file_name, size, alpha) is None and cache.load(file_name, size, alpha) is not None:
+            built += 1
+    if cache.dirty:
+        cache.save()
+    print(f"{len(cache.entries)} images cached ({built} rebuilt) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
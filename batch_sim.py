@@ -0,0 +1,239 @@
+"""Batched purchase-strategy simulator over the shop catalog. Needs NumPy.
+
+Every strategy is one row of the state arrays, so a whole population advances
+in a single vectorized step, each strategy jumping straight to its own next
+purchase or season change. The result is, per strategy, the time at which
+lifetime leafs first reached each milestone.
+"""
+import numpy as np
+from catalog import CATALOG
+from settings import SEASONS, SEASON_MULTIPLIERS, SEASON_DURATION
+
+PLANT_ITEMS = CATALOG.plants
+UPGRADE_ITEMS = CATALOG.upgrades
+RESET_ITEM = next(i for i in CATALOG.shop if i.kind == "crash")
+
+# Column order of a strategy's weight vector: plants first, then upgrades
+ITEM_IDS = [i.id for i in PLANT_ITEMS + UPGRADE_ITEMS]
+
+DEFAULT_MILESTONES = [10.0 ** p for p in range(3, 13)]
+
+
+def random_strategies(count, seed=None):
+    """Random item weights and Market Crash thresholds for `count` strategies."""
+    rng = np.random.default_rng(seed)
+    weights = rng.lognormal(0.0, 1.0, size=(count, len(ITEM_IDS)))
+    reset_ratio = rng.uniform(2.0, 200.0, size=count)
+    return weights, reset_ratio
+
+
+def simulate(weights, reset_ratio=None, duration=6 * 3600, dt=1.0, milestones=DEFAULT_MILESTONES,
+             start_leafs=10.0, season="Spring", cost_scale=1.0, cost_mult=None, rate_scale=1.0,
+             max_buys_per_step=16):
+    """Runs every strategy for `duration` seconds of game time.
+
+    Each strategy saves for the item with the best weighted gain per leaf and
+    buys it once affordable. When that item is a plant inflated past
+    `reset_ratio` times its base cost, it buys the Market Crash instead.
+    `cost_scale`, `cost_mult` and `rate_scale` override the plant catalog and
+    broadcast against (strategies, plants), so one call can sweep prices.
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    count = weights.shape[0]
+    n_plants = len(PLANT_ITEMS)
+
+    if reset_ratio is None:
+        reset_ratio = np.full(count, np.inf)
+    reset_ratio = np.broadcast_to(np.asarray(reset_ratio, dtype=float), (count,))
+
+    # --- CATALOG ---
+    base_cost = np.array([float(i.cost) for i in PLANT_ITEMS]) * np.asarray(cost_scale, dtype=float)
+    base_cost = np.floor(np.broadcast_to(base_cost, (count, n_plants)))
+    if cost_mult is None:
+        cost_mult = [i.cost_mult for i in PLANT_ITEMS]
+    cost_mult = np.broadcast_to(np.asarray(cost_mult, dtype=float), (count, n_plants))
+    rate_boost = np.array([i.rate_boost for i in PLANT_ITEMS]) * np.asarray(rate_scale, dtype=float)
+    rate_boost = np.broadcast_to(rate_boost, (count, n_plants))
+    upgrade_cost = np.broadcast_to(np.array([float(i.cost) for i in UPGRADE_ITEMS]),
+                                   (count, len(UPGRADE_ITEMS)))
+    upgrade_mult = np.array([i.multiplier_value for i in UPGRADE_ITEMS])
+    season_mults = np.array([SEASON_MULTIPLIERS[s] for s in SEASONS])
+
+    # --- STATE ---
+    leafs = np.full(count, float(start_leafs))
+    earned = np.zeros(count)
+    base_rate = np.zeros(count)
+    production_multiplier = np.ones(count)
+    plant_cost = base_cost.copy()
+    plant_counts = np.zeros((count, n_plants), dtype=np.int64)
+    purchased = np.zeros((count, len(UPGRADE_ITEMS)), dtype=bool)
+    reset_cost = np.full(count, float(RESET_ITEM.cost))
+    resets = np.zeros(count, dtype=np.int64)
+
+    milestones = np.asarray(milestones, dtype=float)
+    times = np.full((count, len(milestones)), np.nan)
+    threshold = np.zeros(count)
+
+    def buy_round(idx):
+        """One purchase decision for the strategies in `idx`. Returns the ones that bought something."""
+        costs = np.concatenate([plant_cost[idx], upgrade_cost[idx]], axis=1)
+        multiplier = production_multiplier[idx][:, None]
+        gains = np.concatenate([rate_boost[idx] * multiplier,
+                                base_rate[idx][:, None] * multiplier * (upgrade_mult - 1.0)], axis=1)
+        score = weights[idx] * gains / costs
+        score[:, n_plants:][purchased[idx]] = -np.inf
+        # With no income yet only what is already affordable can ever be bought
+        score[(base_rate[idx] == 0)[:, None] & (costs > leafs[idx][:, None])] = -np.inf
+
+        local = np.arange(len(idx))
+        target = score.argmax(axis=1)
+        target_cost = costs[local, target]
+        stuck = ~np.isfinite(score[local, target])
+        is_plant = target < n_plants
+        plant_col = np.minimum(target, n_plants - 1)
+
+        # Market Crash: int() truncation matches Economy.buy for costs below 2**53
+        inflated = is_plant & (target_cost / base_cost[idx, plant_col] >= reset_ratio[idx])
+        crash = inflated & (leafs[idx] >= reset_cost[idx])
+        r = idx[crash]
+        leafs[r] -= reset_cost[r]
+        plant_cost[r] = base_cost[r]
+        reset_cost[r] = np.floor(reset_cost[r] * RESET_ITEM.cost_mult)
+        resets[r] += 1
+
+        buy = ~crash & ~stuck & (leafs[idx] >= target_cost)
+        r, c = idx[buy & is_plant], target[buy & is_plant]
+        leafs[r] -= plant_cost[r, c]
+        base_rate[r] += rate_boost[r, c]
+        plant_cost[r, c] = np.floor(plant_cost[r, c] * cost_mult[r, c])
+        plant_counts[r, c] += 1
+
+        r, u = idx[buy & ~is_plant], target[buy & ~is_plant] - n_plants
+        leafs[r] -= upgrade_cost[r, u]
+        purchased[r, u] = True
+        production_multiplier[r] *= upgrade_mult[u]
+
+        # Targets only move on a purchase, so nothing happens until leafs reach this again
+        waiting = ~(crash | buy)
+        threshold[idx[waiting]] = np.where(stuck, np.inf,
+                                           np.where(inflated, np.minimum(target_cost, reset_cost[idx]),
+                                                    target_cost))[waiting]
+        return idx[~waiting]
+
+    # --- EVENT LOOP ---
+    # Strategies are independent, so each keeps its own step counter and jumps
+    # straight to its next purchase, season change or the end. In between every
+    # step adds the same gain, applied with one multiply like
+    # Economy.advance_ticks; milestone steps are solved the same way.
+    start_idx = SEASONS.index(season)
+    n_steps = int(round(duration / dt))
+    step = np.zeros(count, dtype=np.int64)
+
+    def first_step(start, per_step, target):
+        """Fewest steps (>= 1) after which start + n * per_step reaches target; inf if it never does."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            n = np.ceil((target - start) / per_step)
+        n = np.where(start >= target, 1, np.where(per_step > 0, np.maximum(n, 1), np.inf))
+        # Correct the float division so the multiply in the jump agrees with it
+        n = np.where((n > 1) & (start + (n - 1) * per_step >= target), n - 1, n)
+        return np.where(np.isfinite(n) & (start + n * per_step < target), n + 1, n)
+
+    while True:
+        live = np.flatnonzero(step < n_steps)
+        if not len(live):
+            break
+        active = live[leafs[live] >= threshold[live]]
+        for _ in range(max_buys_per_step):
+            if not len(active):
+                break
+            active = buy_round(active)
+        # Still buying when the round cap hit: carry on next step
+        threshold[active] = 0
+
+        s = step[live]
+        season_idx = (s * dt // SEASON_DURATION).astype(np.int64)
+        mult = season_mults[(start_idx + season_idx) % len(SEASONS)]
+        per_step = base_rate[live] * production_multiplier[live] * mult * dt
+
+        # First step of the next season, with the same float arithmetic as the season lookup
+        season_end = np.ceil((season_idx + 1) * SEASON_DURATION / dt).astype(np.int64)
+        season_end -= ((season_end - 1) * dt // SEASON_DURATION > season_idx) & (season_end - 1 > s)
+        season_end += (season_end * dt // SEASON_DURATION) <= season_idx
+
+        jump = np.minimum(season_end, n_steps) - s
+        buying = first_step(leafs[live], per_step, threshold[live])
+        jump = np.minimum(jump, buying).astype(np.int64)
+
+        before = earned[live]
+        gain = per_step * jump
+        leafs[live] += gain
+        earned[live] += gain
+
+        pending = np.isnan(times[live]) & ((before + gain)[:, None] >= milestones)
+        if pending.any():
+            r, m = np.nonzero(pending)
+            hit = first_step(before[r], per_step[r], milestones[m])
+            times[live[r], m] = (s[r] + np.minimum(hit, jump[r])) * dt
+        step[live] += jump
+
+    return {
+        "milestones": milestones,
+        "times": times,
+        "leafs": leafs,
+        "earned": earned,
+        "rate": base_rate * production_multiplier,
+        "plant_counts": plant_counts,
+        "upgrades": purchased,
+        "resets": resets
+    }
+
+
+def milestone_curves(times, percentiles=(10, 50, 90)):
+    """Percentile time-to-milestone across the population. NaN where too few strategies got there."""
+    reached = ~np.isnan(times)
+    curves = np.full((len(percentiles), times.shape[1]), np.nan)
+    for m in range(times.shape[1]):
+        if reached[:, m].any():
+            curves[:, m] = np.percentile(times[reached[:, m], m], percentiles)
+    return curves
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Race a population of purchase strategies through the shop.")
+    parser.add_argument("--strategies", type=int, default=1000, help="population size")
+    parser.add_argument("--hours", type=float, default=6.0, help="game time to simulate")
+    parser.add_argument("--dt", type=float, default=1.0, help="seconds per step")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--cost-scale", type=float, default=1.0, help="multiply every plant base cost")
+    parser.add_argument("--rate-scale", type=float, default=1.0, help="multiply every plant rate boost")
+    parser.add_argument("--csv", help="write per-strategy milestone times to this file")
+    args = parser.parse_args(argv)
+
+    weights, reset_ratio = random_strategies(args.strategies, args.seed)
+    start = time.perf_counter()
+    result = simulate(weights, reset_ratio, duration=args.hours * 3600, dt=args.dt,
+                      cost_scale=args.cost_scale, rate_scale=args.rate_scale)
+    took = time.perf_counter() - start
+    print(f"{args.strategies} strategies x {args.hours:g}h in {took:.2f}s")
+
+    curves = milestone_curves(result["times"])
+    reached = (~np.isnan(result["times"])).mean(axis=0)
+    print(f"{'milestone':>10} {'reached':>8} {'p10':>9} {'p50':>9} {'p90':>9}")
+    for m, milestone in enumerate(result["milestones"]):
+        cells = " ".join("        -" if np.isnan(v) else f"{v / 60:8.1f}m" for v in curves[:, m])
+        print(f"{milestone:>10.0e} {reached[m]:>7.0%} {cells}")
+
+    best = int(np.argmax(result["earned"]))
+    print(f"Best strategy #{best}: {result['earned'][best]:.3e} leafs earned, {result['resets'][best]} crashes")
+
+    if args.csv:
+        header = ",".join(["strategy"] + [f"{m:.0e}" for m in result["milestones"]])
+        table = np.column_stack([np.arange(args.strategies), result["times"]])
+        np.savetxt(args.csv, table, delimiter=",", header=header, comments="", fmt="%g")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Headless rendering benchmarks: drives Game under SDL's dummy drivers through scripted scenarios.
+
+    python bench.py                                  # every scenario, results in bench_results.json
+    python bench.py --baseline bench_baseline.json   # also compare; exits 1 on a regression
+    python bench.py --save-baseline bench_baseline.json
+
+Every scenario runs in a fresh process with saves, settings and caches in a
+temp dir, so startup and peak memory are measured in isolation and the real
+save is never touched. Frames run at the normal cap so screens change as fast
+as they do in play; the frame profiler splits off the time spent waiting, and
+"busy" is the rest. "capacity_fps" is the frame rate that busy time would
+allow. Allocation figures come from a second, tracemalloc pass: the Python
+heap a frame allocates on top of what it started with, and the net blocks it
+leaves behind.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+WARMUP_FRAMES = 10
+ALLOC_FRAMES = 60
+
+# Metric -> (direction, noise floor): +1 means higher is worse. A change only
+# counts as a regression beyond both the relative tolerance and the floor.
+CHECKS = {
+    "fps": (-1, 2.0),
+    "capacity_fps": (-1, 0.0),
+    "busy_ms_p95": (+1, 0.5),
+    "alloc_kb_per_frame": (+1, 4.0),
+    "peak_rss_mb": (+1, 5.0),
+    "first_frame_ms": (+1, 20.0),
+}
+
+
+# --- SCENARIOS ---
+# Each is (setup(game), per_frame(game, i) or None, frames or None for --frames)
+def setup_menu(game):
+    game.state = "MENU"
+
+
+def setup_game(plants=0, zoom=0):
+    def setup(game):
+        from bignum import big
+        from catalog import CATALOG
+        game.start_game(new=True)
+        game.game_mgr.economy.upgrade_rate_bonus = big(50)  # Income, so the stat bar changes like in play
+        species = [item.id for item in CATALOG.plants]
+        for i, pid in enumerate(species):
+            game.game_mgr.plant_grid.add(pid, plants // len(species) + (i < plants % len(species)))
+        game.plant_field.zoom(zoom)
+    return setup
+
+
+def setup_shop(is_upgrades):
+    def setup(game):
+        game.start_game(new=True)
+        game.game_mgr.leafs = 10 ** 6
+        game.shop.toggle(is_upgrades=is_upgrades)
+    return setup
+
+
+def scroll_shop(game, i):
+    import pygame
+    # Ten notches down, ten back up
+    pygame.event.post(pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-1 if (i // 10) % 2 == 0 else 1))
+
+
+def keep_fading(game, i):
+    from settings import SEASON_DURATION
+    if not game.next_bg:
+        game.game_mgr.economy.season_timer = SEASON_DURATION
+
+
+SCENARIOS = {
+    "startup": (None, None, 1),
+    # Static screens block for input, so a handful of frames already spans seconds
+    "menu_idle": (setup_menu, None, 5),
+    "game_0": (setup_game(0), None, None),
+    "game_100": (setup_game(100), None, None),
+    "game_10k": (setup_game(10000), None, None),
+    "game_10k_density": (setup_game(10000, zoom=2), None, None),
+    "shop_scroll": (setup_shop(False), scroll_shop, None),
+    "upgrades_open": (setup_shop(True), None, None),
+    "season_crossfade": (setup_game(100), keep_fading, None),
+}
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, round(p / 100 * (len(values) - 1)))]
+
+
+def run_scenario(name, frames):
+    """Runs one scenario in this process and returns its metrics."""
+    import pygame
+    from main import Game
+    from profiler import PHASES
+
+    setup, per_frame, scenario_frames = SCENARIOS[name]
+    frames = scenario_frames or frames
+
+    start = time.perf_counter()
+    game = Game()
+    if name == "startup":
+        game.step()
+        metrics = {"first_frame_ms": (time.perf_counter() - start) * 1000, "peak_rss_mb": peak_rss_mb()}
+        pygame.quit()
+        return metrics
+
+    setup(game)
+
+    def frame(i):
+        if per_frame:
+            per_frame(game, i)
+        game.step()
+
+    for i in range(WARMUP_FRAMES):
+        frame(i)
+
+    # Recording turns the profiler on; its rolling window then holds the timed frames
+    game.profiler.toggle_recording()
+    game.profiler.frames = deque(maxlen=frames)
+    game.profiler.end_frame()
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for i in range(frames):
+        frame(i)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    game.profiler.close()
+    wait = PHASES.index("wait") + 1
+    busy = [row[0] - row[wait] for row in game.profiler.frames]
+
+    # Allocation pass, separate because tracemalloc slows every frame down
+    alloc_frames = min(frames, ALLOC_FRAMES)
+    peaks = []
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    for i in range(alloc_frames):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        frame(i)
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    blocks = sys.getallocatedblocks() - blocks
+    tracemalloc.stop()
+
+    metrics = {
+        "frames": frames,
+        "fps": frames / wall,
+        "capacity_fps": len(busy) / sum(busy),
+        "busy_ms_p50": percentile(busy, 50) * 1000,
+        "busy_ms_p95": percentile(busy, 95) * 1000,
+        "cpu_ms_per_frame": cpu / frames * 1000,
+        "alloc_kb_per_frame": sum(peaks) / alloc_frames / 1024,
+        "blocks_per_frame": blocks / alloc_frames,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    pygame.quit()
+    return metrics
+
+
+def spawn(name, frames, env):
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        out = f.name
+    try:
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", name, "--frames", str(frames),
+                               "--child-out", out], env=env, cwd=HERE, capture_output=True, text=True)
+        if proc.returncode:
+            raise RuntimeError(f"scenario {name} failed:\n{proc.stderr}")
+        with open(out) as f:
+            return json.load(f)
+    finally:
+        os.remove(out)
+
+
+def compare(results, baseline, tolerance):
+    """Human-readable regressions of `results` against `baseline` (both scenario -> metrics)."""
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get(name, {})
+        for key, (direction, floor) in CHECKS.items():
+            new, old = metrics.get(key), base.get(key)
+            if new is None or old is None:
+                continue
+            worse = (new - old) * direction
+            if worse > tolerance * abs(old) and worse > floor:
+                regressions.append(f"{name}: {key} {old:.2f} -> {new:.2f}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark rendering headlessly and compare with a baseline.")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="run only these (repeatable)")
+    parser.add_argument("--frames", type=int, default=300, help="timed frames per scenario")
+    parser.add_argument("--out", default="bench_results.json", help="machine-readable results")
+    parser.add_argument("--baseline", help="results file to compare against; exit 1 on a regression")
+    parser.add_argument("--save-baseline", help="also write the results here as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="relative change allowed before failing")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--child-out", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        with open(args.child_out, "w") as f:
+            json.dump(run_scenario(args.child, args.frames), f)
+        return 0
+
+    names = args.scenario or list(SCENARIOS)
+    with tempfile.TemporaryDirectory() as save_dir:
+        env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1",
+                   LEAFY_LOOT_SAVE_DIR=save_dir)
+        # Warm asset cache, as on every launch after the first
+        subprocess.run([sys.executable, "assetcache.py"], env=env, cwd=HERE, capture_output=True, check=True)
+
+        results = {}
+        print(f"{'scenario':<18} {'fps':>6} {'capacity':>9} {'busy p50':>9} {'busy p95':>9} {'cpu ms':>7} "
+              f"{'alloc KB':>9} {'peak MB':>8}")
+        for name in names:
+            m = results[name] = spawn(name, args.frames, env)
+            if name == "startup":
+                print(f"{name:<18} first frame {m['first_frame_ms']:.1f} ms, peak {m['peak_rss_mb'] or 0:.1f} MB")
+                continue
+            print(f"{name:<18} {m['fps']:>6.1f} {m['capacity_fps']:>9.0f} {m['busy_ms_p50']:>9.2f} "
+                  f"{m['busy_ms_p95']:>9.2f} {m['cpu_ms_per_frame']:>7.2f} {m['alloc_kb_per_frame']:>9.1f} "
+                  f"{m['peak_rss_mb'] or 0:>8.1f}")
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "frames": args.frames,
+        "scenarios": results,
+    }
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["scenarios"]
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""Fixed-precision big numbers for leafs, costs and rates. Imports nothing from pygame.
+
+A BigNum is a float mantissa and an integer binary exponent, m * 2**e. Every
+value below 2**EXP_LIMIT is kept as the plain float with e == 0, so in that
+range each operation is a single float operation and gives exactly what
+floats did before. Past it the mantissa stays in [0.5, 1) and only the
+exponent grows: values never overflow to inf, never become ever-longer
+Python ints, and cost the same to compare and save however large they get.
+"""
+import math
+
+EXP_LIMIT = 1000  # Values below 2**EXP_LIMIT are stored as plain floats
+FLOAT_LIMIT = 2.0 ** EXP_LIMIT
+INT_LIMIT = 2.0 ** 53  # Every float from here up is a whole number
+LOG10_2 = math.log10(2)
+
+# Short-scale suffixes for format_short, one per power of 1000; past the last, scientific notation
+SUFFIXES = ["", "K", "M", "B", "T", "Qa", "Qi", "Sx", "Sp", "Oc", "No", "Dc"]
+
+
+def _new(m, e=0):
+    b = object.__new__(BigNum)
+    b.m = m
+    b.e = e
+    return b
+
+
+def _norm(m, e=0):
+    """The canonical BigNum for m * 2**e."""
+    if e == 0 and -FLOAT_LIMIT < m < FLOAT_LIMIT:
+        return _new(m)
+    if m == 0 or math.isinf(m) or math.isnan(m):
+        return _new(m * 1.0)
+    m, shift = math.frexp(m)
+    e += shift
+    if e <= EXP_LIMIT:
+        return _new(math.ldexp(m, e))
+    return _new(m, e)
+
+
+def big(value):
+    """`value` (BigNum, int, float or a saved string) as a BigNum."""
+    if type(value) is BigNum:
+        return value
+    if isinstance(value, float):
+        return _norm(value)
+    if isinstance(value, int):
+        if -FLOAT_LIMIT < value < FLOAT_LIMIT:
+            return _new(float(value))
+        # Ints past the float range (old saves): keep the top 64 bits
+        shift = abs(value).bit_length() - 64
+        return _norm(float(value >> shift), shift)
+    if isinstance(value, str):
+        return BigNum.from_json(value)
+    raise TypeError(f"cannot make a BigNum from {type(value).__name__}")
+
+
+def _coerce(value):
+    return value if type(value) is BigNum else big(value) if isinstance(value, (int, float)) else None
+
+
+class BigNum:
+    """m * 2**e; see the module docstring. Immutable, hashable and interchangeable with int and float."""
+
+    __slots__ = ("m", "e")
+
+    def __init__(self, value=0.0):
+        b = big(value)
+        self.m = b.m
+        self.e = b.e
+
+    # --- ARITHMETIC ---
+    def __add__(self, other):
+        o = _coerce(other)
+        if o is None:
+            return NotImplemented
+        if self.e == 0 and o.e == 0:
+            return _norm(self.m + o.m)
+        if o.m == 0:
+            return self
+        if self.m == 0:
+            return o
+        am, ae = math.frexp(self.m)
+        bm, be = math.frexp(o.m)
+        ae += self.e
+        be += o.e
+        # Past 60 bits apart the smaller one vanishes in the mantissa anyway
+        if ae - be > 60:
+            return self
+        if be - ae > 60:
+            return o
+        return _norm(am + math.ldexp(bm, be - ae), ae)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        o = _coerce(other)
+        if o is None:
+            return NotImplemented
+        return self + _new(-o.m, o.e)
+
+    def __rsub__(self, other):
+        o = _coerce(other)
+        if o is None:
+            return NotImplemented
+        return o + _new(-self.m, self.e)
+
+    def __mul__(self, other):
+        o = _coerce(other)
+        if o is None:
+            return NotImplemented
+        if self.e == 0 and o.e == 0:
+            p = self.m * o.m
+            if -FLOAT_LIMIT < p < FLOAT_LIMIT:
+                return _new(p)
+        am, ae = math.frexp(self.m)
+        bm, be = math.frexp(o.m)
+        return _norm(am * bm, ae + self.e + be + o.e)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        o = _coerce(other)
+        if o is None:
+            return NotImplemented
+        if self.e == 0 and o.e == 0:
+            return _norm(self.m / o.m)
+        am, ae = math.frexp(self.m)
+        bm, be = math.frexp(o.m)
+        return _norm(am / bm, ae + self.e - be - o.e)
+
+    def __rtruediv__(self, other):
+        o = _coerce(other)
+        if o is None:
+            return NotImplemented
+        return o / self
+
+    def __floordiv__(self, other):
+        result = self / other
+        return NotImplemented if result is NotImplemented else result.floor()
+
+    def __pow__(self, n):
+        """Whole powers only, by repeated squaring: log2(n) multiplies."""
+        if not isinstance(n, int) or n < 0:
+            return NotImplemented
+        result, base = _new(1.0), self
+        while n:
+            if n & 1:
+                result = result * base
+            base = base * base
+            n >>= 1
+        return result
+
+    def __neg__(self):
+        return _new(-self.m, self.e)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return self if self.m >= 0 else _new(-self.m, self.e)
+
+    def floor(self):
+        """Rounded down to a whole number. Anything past 2**53 already is one."""
+        if self.e or not -INT_LIMIT < self.m < INT_LIMIT:
+            return self
+        return _new(float(math.floor(self.m)))
+
+    # --- COMPARISON ---
+    def _cmp(self, o):
+        if self.e == o.e:
+            return (self.m > o.m) - (self.m < o.m)
+        sign = (self.m > 0) - (self.m < 0)
+        other_sign = (o.m > 0) - (o.m < 0)
+        if sign != other_sign:
+            return (sign > other_sign) - (sign < other_sign)
+        # Same sign, and at least one is past the float range: the larger exponent is further from zero
+        return sign if self.e > o.e else -sign
+
+    def __eq__(self, other):
+        o = _coerce(other)
+        if o is None:
+            return NotImplemented
+        return self.m == o.m and self.e == o.e
+
+    def __lt__(self, other):
+        if self.e == 0 and isinstance(other, float):
+            return self.m < other
+        o = _coerce(other)
+        return NotImplemented if o is None else self._cmp(o) < 0
+
+    def __le__(self, other):
+        if self.e == 0 and isinstance(other, float):
+            return self.m <= other
+        o = _coerce(other)
+        return NotImplemented if o is None else self._cmp(o) <= 0
+
+    def __gt__(self, other):
+        if self.e == 0 and isinstance(other, float):
+            return self.m > other
+        o = _coerce(other)
+        return NotImplemented if o is None else self._cmp(o) > 0
+
+    def __ge__(self, other):
+        if self.e == 0 and isinstance(other, float):
+            return self.m >= other
+        o = _coerce(other)
+        return NotImplemented if o is None else self._cmp(o) >= 0
+
+    def __hash__(self):
+        # Equal to the float (and int) of the same value, so either works as a dict key
+        return hash(self.m) if self.e == 0 else hash((self.m, self.e))
+
+    def __bool__(self):
+        return self.m != 0
+
+    # --- CONVERSION ---
+    def __float__(self):
+        return self.m if self.e == 0 else math.copysign(math.inf, self.m)
+
+    def __int__(self):
+        if self.e == 0:
+            return int(self.m)
+        return int(math.ldexp(self.m, 53)) << (self.e - 53)
+
+    def log10(self):
+        if self.e == 0:
+            return math.log10(abs(self.m))
+        m, e = math.frexp(self.m)
+        return math.log10(abs(m)) + (e + self.e) * LOG10_2
+
+    def to_json(self):
+        """An int or float while the value fits one, otherwise an exact hex string like "0x1.8p+1500"."""
+        if self.e == 0:
+            return int(self.m) if self.m.is_integer() and -INT_LIMIT < self.m < INT_LIMIT else self.m
+        head, exp = float.hex(self.m).split("p")
+        return f"{head}p{int(exp) + self.e:+d}"
+
+    @classmethod
+    def from_json(cls, value):
+        if not isinstance(value, str):
+            return big(value)
+        head, sep, exp = value.partition("p")
+        if not head.lower().lstrip("-").startswith("0x") or not sep:
+            return _norm(float(value))
+        return _norm(float.fromhex(head + "p0"), int(exp))
+
+    # --- FORMATTING ---
+    def format_short(self, decimals=0):
+        """Compact text for the HUD: "999", "12.3K", "4.56Qa", "7.89e45".
+
+        Below 1000 the value is shown with `decimals` places (0 truncates, like
+        int()). Larger values keep three significant digits and are truncated,
+        never rounded, so the label never shows more than there is.
+        """
+        if self.e == 0 and -1000 < self.m < 1000:
+            return f"{self.m:.{decimals}f}" if decimals else str(int(self.m))
+        sign = "-" if self.m < 0 else ""
+        value = abs(self)
+        exp10 = math.floor(value.log10())
+        if value.e == 0:
+            # The log can land a hair off at exact powers of ten
+            if value.m >= 10.0 ** (exp10 + 1):
+                exp10 += 1
+            elif value.m < 10.0 ** exp10:
+                exp10 -= 1
+        tier = exp10 // 3
+        scientific = tier >= len(SUFFIXES)
+        shift = exp10 if scientific else tier * 3
+        if value.e == 0:
+            mantissa = value.m / 10.0 ** shift
+        else:
+            mantissa = 10 ** min(value.log10() - shift, 1 - 1e-12)
+        places = 2 - (exp10 - shift)
+        scale = 10 ** places
+        mantissa = math.floor(mantissa * scale * (1 + 1e-12)) / scale
+        text = f"{sign}{mantissa:.{places}f}"
+        return f"{text}e{shift}" if scientific else text + SUFFIXES[tier]
+
+    def __format__(self, spec):
+        if self.e == 0:
+            return format(self.m, spec)
+        return self.format_short()
+
+    def __str__(self):
+        return self.format_short()
+
+    def __repr__(self):
+        return f"BigNum({self.to_json()!r})"
+
+
+def format_short(value, decimals=0):
+    """format_short for any number."""
+    return big(value).format_short(decimals)
@@ -0,0 +1,69 @@
+"""Item catalog: every plant, Market Crash and upgrade the shops sell. Imports nothing from pygame.
+
+Definitions come from catalog.json, are loaded once and never change while
+the game runs. What an economy has paid and owns lives in economy.ItemState,
+and what the shop is showing lives in Shop, so adding a tier is one line in
+catalog.json.
+"""
+import json
+from settings import CATALOG_FILE
+from bignum import big
+
+
+class CatalogError(ValueError):
+    """catalog.json is missing a field, has an unknown one or repeats an id."""
+
+
+class ItemDef:
+    """One catalog entry. `kind` is "plant", "crash" (resets plant costs) or "upgrade"."""
+
+    __slots__ = ("index", "id", "kind", "name", "desc", "cost", "cost_mult", "rate_boost", "multiplier_value",
+                 "image", "single")
+
+    FIELDS = {"id", "name", "desc", "cost", "cost_mult", "rate_boost", "multiplier_value", "resets_costs", "image"}
+
+    def __init__(self, index, data, is_upgrade=False):
+        unknown = set(data) - self.FIELDS
+        if unknown:
+            raise CatalogError(f"{data.get('id', index)}: unknown fields {sorted(unknown)}")
+        try:
+            self.id = data["id"]
+            self.name = data["name"]
+            self.cost = big(data["cost"])
+        except KeyError as e:
+            raise CatalogError(f"{data.get('id', index)}: missing {e}")
+        self.index = index
+        self.desc = data.get("desc", "")
+        self.kind = "upgrade" if is_upgrade else "crash" if data.get("resets_costs") else "plant"
+        self.cost_mult = data.get("cost_mult", 1.1)
+        self.rate_boost = data.get("rate_boost", 0.0)
+        self.multiplier_value = data.get("multiplier_value", 1.0)
+        self.image = data.get("image", f"{self.id}.png")
+        self.single = self.kind != "plant"  # Bought one at a time, whatever the bulk mode
+
+    def __repr__(self):
+        return f"ItemDef({self.id!r}, {self.kind})"
+
+
+class Catalog:
+    def __init__(self, data):
+        shop, upgrades = data.get("shop", []), data.get("upgrades", [])
+        self.items = [ItemDef(i, entry) for i, entry in enumerate(shop)]
+        self.items += [ItemDef(len(shop) + i, entry, is_upgrade=True) for i, entry in enumerate(upgrades)]
+        self.shop = self.items[:len(shop)]
+        self.upgrades = self.items[len(shop):]
+        self.plants = [item for item in self.shop if item.kind == "plant"]
+
+        self.by_id = {}
+        for item in self.items:
+            if item.id in self.by_id:
+                raise CatalogError(f"duplicate item id {item.id!r}")
+            self.by_id[item.id] = item
+
+
+def load_catalog(path=CATALOG_FILE):
+    with open(path, encoding="utf-8") as f:
+        return Catalog(json.load(f))
+
+
+CATALOG = load_catalog()
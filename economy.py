@@ -0,0 +1,493 @@
+"""Headless leaf economy. Imports nothing from pygame, so it runs without SDL.
+
+GameManager and Shop in game_logic.py are views over the Economy defined here.
+"""
+import math
+import sys
+import time
+from collections import deque
+from settings import SEASONS, SEASON_MULTIPLIERS, SEASON_DURATION, PLANT_RECENT_LIMIT, BULK_MODES
+from bignum import big, format_short, INT_LIMIT
+from catalog import CATALOG
+
+# Items past 2**53 that Economy.quote still prices one at a time: the largest fixed bulk amount
+EXACT_QUOTE_STEPS = max(m for m in BULK_MODES if m)
+
+
+def calculate_offline_progress(season, season_timer, base_rate, production_multiplier, elapsed):
+    """Closed-form leaf gain over `elapsed` seconds, split at season boundaries.
+
+    Whole years are collapsed into a single multiply, so the cost is the same
+    for ten seconds or ten days away. The leafs earned are a BigNum.
+    """
+    elapsed = max(0.0, float(elapsed))
+    rate = big(base_rate) * production_multiplier
+    idx = SEASONS.index(season) if season in SEASONS else 0
+    timer = min(max(0.0, season_timer), SEASON_DURATION)
+
+    earned = big(0)
+    seasons_passed = 0
+    remaining = elapsed
+
+    # 1. Finish the season we are currently in
+    first = min(remaining, SEASON_DURATION - timer)
+    earned += rate * SEASON_MULTIPLIERS[SEASONS[idx]] * first
+    remaining -= first
+    timer += first
+
+    if remaining > 0:
+        idx = (idx + 1) % len(SEASONS)
+        seasons_passed += 1
+        timer = 0.0
+
+        # 2. Full years: every season contributes one full SEASON_DURATION
+        year_length = SEASON_DURATION * len(SEASONS)
+        years, remaining = divmod(remaining, year_length)
+        if years:
+            earned += rate * SEASON_DURATION * sum(SEASON_MULTIPLIERS.values()) * years
+            seasons_passed += int(years) * len(SEASONS)
+
+        # 3. At most one more partial year, one segment per season
+        while remaining >= SEASON_DURATION:
+            earned += rate * SEASON_MULTIPLIERS[SEASONS[idx]] * SEASON_DURATION
+            remaining -= SEASON_DURATION
+            idx = (idx + 1) % len(SEASONS)
+            seasons_passed += 1
+        earned += rate * SEASON_MULTIPLIERS[SEASONS[idx]] * remaining
+        timer = remaining
+
+    return {
+        "elapsed": elapsed,
+        "leafs_earned": earned,
+        "seasons_passed": seasons_passed,
+        "start_season": season,
+        "end_season": SEASONS[idx],
+        "season_timer": timer
+    }
+
+
+class PlantGrid:
+    """Plants as per-species counts plus the most recent purchases, newest first.
+
+    Adding is O(1) however many plants are bought at once, and memory and save
+    size stay flat no matter how large the garden grows.
+    """
+
+    def __init__(self, counts=None, recent=()):
+        self.counts = dict(counts or {})
+        self.total = sum(self.counts.values())
+        self.recent = deque(recent, maxlen=PLANT_RECENT_LIMIT)
+
+    @classmethod
+    def from_save(cls, save_data):
+        if "plant_counts" in save_data:
+            return cls(save_data["plant_counts"], save_data.get("recent_plants", []))
+
+        # Older saves kept one id per plant, newest first
+        grid = cls()
+        for item_id in reversed(save_data.get("plant_grid", [])):
+            grid.add(item_id)
+
+        # Legacy support for saves that only stored a count
+        loaded_plant_count = save_data.get("plants", 0)
+        if loaded_plant_count > 0 and not grid.total:
+            grid.add("buy_plant", loaded_plant_count)
+        return grid
+
+    def __len__(self):
+        return self.total
+
+    def add(self, item_id, count=1):
+        self.counts[item_id] = self.counts.get(item_id, 0) + count
+        self.total += count
+        self.recent.extendleft([item_id] * min(count, PLANT_RECENT_LIMIT))
+
+    def most_recent(self, n=PLANT_RECENT_LIMIT):
+        """Ids of the `n` newest plants, newest first (at most PLANT_RECENT_LIMIT)."""
+        return list(self.recent)[:n]
+
+    def get_save_data(self):
+        return {"plant_counts": dict(self.counts), "recent_plants": list(self.recent)}
+
+
+class ItemState:
+    """An economy's current price and ownership of one catalog item."""
+
+    __slots__ = ("defn", "cost", "purchased")
+
+    def __init__(self, defn):
+        self.defn = defn
+        self.cost = defn.cost
+        self.purchased = False
+
+
+class Economy:
+    """Leafs, costs and the rate are BigNums; see bignum.py."""
+
+    def __init__(self, save_data):
+        self.leafs = big(save_data.get("leafs", 0))
+        self.plant_grid = PlantGrid.from_save(save_data)
+        self.season = save_data.get("season", "Spring")
+        self.upgrade_rate_bonus = big(save_data.get("upgrade_rate_bonus", 0))
+        self.production_multiplier = save_data.get("production_multiplier", 1.0)
+
+        self.seasons = SEASONS
+        self.season_timer = save_data.get("season_timer", 0)
+        self.season_change_timer = 0
+        self.just_changed_season = False  # Flag for the view to detect change
+
+        # --- SHOP STATE ---
+        # One ItemState per catalog entry, in catalog order
+        self.items = [ItemState(defn) for defn in CATALOG.items]
+        self.shop_items = self.items[:len(CATALOG.shop)]
+        self.upgrade_items = self.items[len(CATALOG.shop):]
+        self.items_by_id = {item.defn.id: item for item in self.items}
+        self.load_state(save_data.get("shop_state"))
+
+        # --- JOURNAL ---
+        # Set to a list to collect economy events for SaveManager.append_journal
+        self.journal = None
+        for record in save_data.get("journal", ()):
+            self.apply_event(record)
+
+    @property
+    def plants(self):
+        return len(self.plant_grid)
+
+    @property
+    def rate(self):
+        multiplier = SEASON_MULTIPLIERS.get(self.season, 1.0)
+        return self.upgrade_rate_bonus * multiplier * self.production_multiplier
+
+    def apply_offline_progress(self, elapsed):
+        """Advances leafs, season and season timer by `elapsed` seconds. Returns the summary."""
+        summary = calculate_offline_progress(self.season, self.season_timer, self.upgrade_rate_bonus,
+                                             self.production_multiplier, elapsed)
+        self.leafs += summary["leafs_earned"]
+        self.season = summary["end_season"]
+        self.season_timer = summary["season_timer"]
+        return summary
+
+    def update(self, dt):
+        self.just_changed_season = False
+
+        # Season Logic
+        if self.season_timer + dt >= SEASON_DURATION:
+            # Frames that cross a season boundary, however long (a throttled or suspended
+            # window), are settled in closed form so play matches calculate_offline_progress
+            if self.apply_offline_progress(dt)["seasons_passed"]:
+                self.season_change_timer = 3.0
+                self.just_changed_season = True
+        else:
+            self.season_timer += dt
+            self.leafs += self.rate * dt
+
+        if self.season_change_timer > 0:
+            self.season_change_timer -= dt
+
+        if self.just_changed_season:
+            self.log_event("season")
+
+    def advance_ticks(self, ticks, dt, policy=None):
+        """Runs `ticks` fixed-size updates, jumping over stretches where nothing can change.
+
+        Within one season and between purchases every tick adds the same amount,
+        so those runs are applied with a single multiply. `policy(economy)` may
+        return the id of the item it wants next; it is bought as soon as it is
+        affordable.
+        """
+        while ticks > 0:
+            wanted = None
+            while policy:
+                wanted = policy(self)
+                if wanted is None or not self.buy(wanted):
+                    break
+
+            # Ticks that stay inside the current season
+            steps = int((SEASON_DURATION - self.season_timer) / dt)
+            if self.season_timer + steps * dt >= SEASON_DURATION:
+                steps -= 1
+            steps = min(ticks, max(0, steps))
+
+            # Ticks until the wanted item becomes affordable
+            per_tick = self.rate * dt
+            if wanted is not None and per_tick > 0:
+                short = self.items_by_id[wanted].cost - self.leafs
+                steps = min(steps, max(0, int(short / per_tick)))
+
+            if steps > 0:
+                self.leafs += per_tick * steps
+                self.season_timer += dt * steps
+                self.season_change_timer = max(0, self.season_change_timer - dt * steps)
+                ticks -= steps
+            else:
+                self.update(dt)
+                ticks -= 1
+
+    def get_stats(self):
+        return {
+            "leafs": self.leafs.floor(),
+            "plants": self.plants,
+            "season": self.season,
+            "rate": self.rate,
+            "season_visual_alpha": int((self.season_change_timer / 3.0) * 255) if self.season_change_timer > 0 else 0
+        }
+
+    # --- SHOP RULES ---
+    def can_afford(self, item_id):
+        return self.leafs >= self.items_by_id[item_id].cost
+
+    def quote(self, item_id, amount=1, budget=None):
+        """Price of buying `amount` of an item in a row, or as many as `budget` allows if `amount` is None.
+
+        Returns (count, total, next_cost). Prices follow the same sequence as
+        single purchases, so a batch costs exactly what the clicks would have:
+        below 2**53 the floor()ed prices are walked (a few hundred steps at
+        most), and past it the next EXACT_QUOTE_STEPS prices are still one
+        multiply each. Only a longer MAX run is summed as a geometric series.
+        Owned upgrades quote 0; upgrades and the Market Crash never quote
+        more than one.
+        """
+        item = self.items_by_id[item_id]
+        cost = item.cost
+        if item.purchased:
+            return 0, big(0), cost
+
+        limit = 1 if item.defn.single else amount
+        mult = item.defn.cost_mult
+
+        # Prices below 2**53 are plain floats (see bignum.py), so the walk runs on floats
+        count, total = 0, 0.0
+        c = float(cost) if cost < INT_LIMIT else INT_LIMIT
+        while (limit is None or count < limit) and c < INT_LIMIT:
+            if budget is not None and total + c > budget:
+                return count, big(total), big(c)
+            next_cost = float(math.floor(c * mult))
+            if next_cost == c:
+                # Truncation pinned the price: the rest of the batch is a flat run
+                flat = (budget - total) // c if budget is not None else float("inf")
+                n = int(min(flat, float("inf") if limit is None else limit - count))
+                return count + n, big(total) + n * c, big(c)
+            count += 1
+            total += c
+            c = next_cost
+        total = big(total)
+        if count:
+            cost = big(c)
+
+        # floor() no longer moves the price; every fixed bulk amount still prices click by click
+        for _ in range(EXACT_QUOTE_STEPS):
+            if limit is not None and count >= limit:
+                return count, total, cost
+            if budget is not None and total + cost > budget:
+                return count, total, cost
+            count += 1
+            total += cost
+            cost = cost * mult
+
+        if limit is not None and count >= limit:
+            return count, total, cost
+        if mult <= 1:
+            # A price that never rises (no catalog item does): a flat run
+            n = limit - count if budget is None else int((budget - total) // cost)
+            if limit is not None:
+                n = min(n, limit - count)
+            return count + n, total + n * cost, cost
+
+        # Geometric series: n more cost cost * (mult**n - 1) / (mult - 1)
+        def series(n):
+            return cost * (big(mult) ** n - 1) / (mult - 1)
+
+        if budget is None:
+            n = limit - count
+        else:
+            spare = budget - total
+            n = int(((spare * (mult - 1) / cost) + 1).log10() / math.log10(mult)) if spare >= cost else 0
+            # The log is a float estimate; settle the last step against the series itself
+            while n > 0 and series(n) > spare:
+                n -= 1
+            while series(n + 1) <= spare:
+                n += 1
+            if limit is not None:
+                n = min(n, limit - count)
+        return count + n, total + series(n), cost * big(mult) ** n
+
+    def buy(self, item_id, amount=1):
+        """Buys `amount` of an item (None = as many as affordable) in one step. Returns the count bought.
+
+        A fixed amount is all or nothing; an owned upgrade buys nothing.
+        """
+        item = self.items_by_id[item_id]
+        if amount is None:
+            count, total, next_cost = self.quote(item_id, None, self.leafs)
+        else:
+            count, total, next_cost = self.quote(item_id, amount)
+            if total > self.leafs:
+                return 0
+        if count == 0:
+            return 0
+
+        self.leafs -= total
+        kind = self.apply_purchase(item, count, next_cost)
+        self.log_event(kind, id=item_id, n=count)
+        return count
+
+    def apply_purchase(self, item, count, next_cost):
+        """Applies the effects of `count` purchases of `item`, already paid for. Returns the event kind."""
+        item.cost = next_cost
+        defn = item.defn
+
+        if defn.kind == "crash":
+            for s_item in self.shop_items:
+                if s_item.defn.kind == "plant":
+                    s_item.cost = s_item.defn.cost
+            return "crash"
+
+        if defn.kind == "upgrade":
+            item.purchased = True
+            self.production_multiplier *= defn.multiplier_value
+            return "upgrade"
+
+        self.plant_grid.add(defn.id, count)
+        self.upgrade_rate_bonus += defn.rate_boost * count
+        return "buy"
+
+    # --- JOURNAL ---
+    def log_event(self, kind, **fields):
+        """Records an economy event with the leafs and season it left behind."""
+        if self.journal is None: return
+        fields.update(e=kind, t=time.time(), leafs=self.leafs.to_json(), season=self.season, timer=self.season_timer)
+        self.journal.append(fields)
+
+    def take_journal(self):
+        """Returns the events logged since the last call and clears them."""
+        if not self.journal: return []
+        events, self.journal = self.journal, []
+        return events
+
+    def apply_event(self, record):
+        """Replays one journal record on top of a snapshot. Purchases of ids no longer in the catalog are skipped."""
+        item = self.items_by_id.get(record.get("id"))
+        if record["e"] in ("buy", "upgrade", "crash") and item is not None:
+            count, _, next_cost = self.quote(item.defn.id, record["n"])
+            self.apply_purchase(item, count, next_cost)
+        self.leafs = big(record["leafs"])
+        self.season = record["season"]
+        self.season_timer = record["timer"]
+
+    def get_state(self):
+        return {
+            "shop_items": [{"id": i.defn.id, "cost": i.cost.to_json()} for i in self.shop_items],
+            "upgrade_items": [{"id": i.defn.id, "purchased": i.purchased} for i in self.upgrade_items]
+        }
+
+    def load_state(self, data):
+        """Restores saved costs and owned upgrades. Ids no longer in the catalog are skipped."""
+        if not data: return
+        for saved in data.get("shop_items", []):
+            item = self.items_by_id.get(saved["id"])
+            if item is not None and item.defn.kind != "upgrade":
+                item.cost = big(saved["cost"])
+
+        for saved in data.get("upgrade_items", []):
+            item = self.items_by_id.get(saved["id"])
+            if item is not None and item.defn.kind == "upgrade":
+                item.purchased = saved["purchased"]
+
+    def get_save_data(self):
+        data = {
+            "leafs": self.leafs.to_json(),
+            "plants": self.plants,
+            "season": self.season,
+            "season_timer": self.season_timer,
+            "upgrade_rate_bonus": self.upgrade_rate_bonus.to_json(),
+            "production_multiplier": self.production_multiplier,
+            "shop_state": self.get_state()
+        }
+        data.update(self.plant_grid.get_save_data())
+        return data
+
+
+# --- HEADLESS CLI ---
+def cheapest_policy(economy):
+    """Always saves for the cheapest plant or upgrade that is still for sale."""
+    for_sale = [i for i in economy.shop_items if i.defn.kind == "plant"]
+    for_sale += [i for i in economy.upgrade_items if not i.purchased]
+    return min(for_sale, key=lambda i: i.cost).defn.id
+
+
+POLICIES = {
+    "idle": None,
+    "cheapest": cheapest_policy
+}
+
+
+def check_quotes(samples, seed=None):
+    """Prices random costs past 2**53 by quote and click by click. Returns the mismatches found."""
+    import random
+    rng = random.Random(seed)
+    item_id = CATALOG.plants[0].id
+    mult = CATALOG.plants[0].cost_mult
+    problems = []
+    for _ in range(samples):
+        if rng.random() < 0.5:
+            cost = big(2.0 ** rng.uniform(53, 62))
+        else:
+            cost = big(f"0x1.{rng.getrandbits(52):013x}p+{rng.randint(62, 3000)}")  # Past the float range too
+        economy = Economy({"leafs": cost})
+        economy.items_by_id[item_id].cost = cost
+
+        clicks, price = big(0), cost
+        for n in range(1, max(filter(None, BULK_MODES)) + 1):
+            clicks += price
+            price = (price * mult).floor()
+            if n in BULK_MODES and economy.quote(item_id, n)[1:] != (clicks, price):
+                problems.append(f"{cost!r} x{n}: quoted {economy.quote(item_id, n)[1:]!r}, clicks {(clicks, price)!r}")
+        if not economy.can_afford(item_id) or economy.buy(item_id, None) != 1:
+            problems.append(f"{cost!r}: leafs equal to the price do not buy one")
+    return problems
+
+
+def main(argv=None):
+    import argparse
+    from savefile import read_save, write_save
+
+    parser = argparse.ArgumentParser(description="Advance a Leafy Loot save without opening a window.")
+    parser.add_argument("save", nargs="?", help="save file to start from (default: a new game)")
+    parser.add_argument("--ticks", type=int, default=1_000_000, help="number of fixed updates to run")
+    parser.add_argument("--dt", type=float, default=1 / 60, help="seconds per tick")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="idle", help="purchase strategy")
+    parser.add_argument("--out", help="write the resulting save data to this file")
+    parser.add_argument("--check-quotes", type=int, metavar="N",
+                        help="compare bulk quotes for N prices past 2**53 with clicks; exit 1 on a mismatch")
+    args = parser.parse_args(argv)
+
+    if args.check_quotes:
+        problems = check_quotes(args.check_quotes)
+        for line in problems:
+            print(f"MISMATCH {line}")
+        print(f"{args.check_quotes} prices checked, {len(problems)} mismatches")
+        return 1 if problems else 0
+
+    if args.save:
+        save_data = read_save(args.save)
+    else:
+        save_data = {"leafs": 10, "season": "Spring", "plants": 0}
+
+    economy = Economy(save_data)
+    start = time.perf_counter()
+    economy.advance_ticks(args.ticks, args.dt, POLICIES[args.policy])
+    took = time.perf_counter() - start
+
+    stats = economy.get_stats()
+    print(f"{args.ticks} ticks ({args.ticks * args.dt:.0f}s of game time) in {took:.3f}s "
+          f"({args.ticks / max(took, 1e-9):,.0f} ticks/s)")
+    print(f"Leafs: {format_short(stats['leafs'])}  Plants: {stats['plants']}  Rate: {format_short(stats['rate'], 1)}/s  "
+          f"Season: {stats['season']}")
+
+    if args.out:
+        write_save(args.out, economy.get_save_data())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
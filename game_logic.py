@@ -1,72 +1,87 @@
 import pygame
-import os
+import time
 from settings import *
+from economy import Economy
+from catalog import CATALOG
+from bignum import big, format_short
+from fonts import get_font, render_text
+from ui import VirtualList
 
 
 class GameManager:
-    def __init__(self, save_data):
-        self.leafs = save_data.get("leafs", 0)
-        self.plant_grid = save_data.get("plant_grid", [])
-        self.season = save_data.get("season", "Spring")
-        self.upgrade_rate_bonus = save_data.get("upgrade_rate_bonus", 0)
-        self.production_multiplier = save_data.get("production_multiplier", 1.0)
-
-        # Legacy support for old saves
-        loaded_plant_count = save_data.get("plants", 0)
-        if loaded_plant_count > 0 and not self.plant_grid:
-            for _ in range(loaded_plant_count):
-                self.plant_grid.insert(0, "buy_plant")
-
-        self.seasons = ["Spring", "Summer", "Fall", "Winter"]
-        self.season_timer = 0
-        self.season_change_timer = 0
-        self.just_changed_season = False  # Flag for Main to detect change
-
-        # --- ASSET LOADING ---
-        self.plant_images = {}
-
-        # We load textures for ALL known IDs.
-        # If the file doesn't exist, universal_load handles it.
-        known_plants = [
-            "maple_sapling", "oak_tree", "willow_tree",
-            "ginkgo_tree", "ancient_banyan", "crystal_tree", "spirit_blossom"
-        ]
-
-        for pid in known_plants:
-            # Assumes file name matches ID + .png, e.g., "oak_tree.png"
-            # Special case for "buy_plant" which was historically "plant.png"
-            fname = "plant.png" if pid == "buy_plant" else f"{pid}.png"
-            self.plant_images[pid] = self.universal_load(fname)
-
-    def universal_load(self, file_name):
-        """Loads image, falls back to missing.png, falls back to magenta square."""
-        path = os.path.join(ASSETS_DIR, file_name)
-
-        # 1. Try Loading Real Image
-        if os.path.exists(path):
-            try:
-                img = pygame.image.load(path).convert_alpha()
-                return pygame.transform.scale(img, (40, 40))
-            except:
-                pass
-
-        # 2. Try Loading missing.png
-        missing_path = os.path.join(ASSETS_DIR, "missing.png")
-        if os.path.exists(missing_path):
-            try:
-                img = pygame.image.load(missing_path).convert_alpha()
-                return pygame.transform.scale(img, (40, 40))
-            except:
-                pass
-
-        # 3. Create Magenta Fallback Surface
-        surf = pygame.Surface((40, 40))
-        surf.fill((255, 0, 255))
-        return surf
+    def __init__(self, save_data, assets, offline_elapsed=None):
+        # All leaf/season/shop rules live in the headless Economy; this class adds textures and layout
+        self.economy = Economy(save_data)
+        self.economy.journal = []  # Drained by the autosaver
+
+        # --- OFFLINE PROGRESS ---
+        # Credit the time since the save was written in one step instead of replaying frames.
+        # A replay passes the elapsed time its recording credited.
+        self.offline_summary = None
+        if offline_elapsed is None:
+            last_updated = save_data.get("last_updated")
+            offline_elapsed = time.time() - last_updated if last_updated else 0.0
+        self.offline_elapsed = offline_elapsed
+        if offline_elapsed:
+            summary = self.economy.apply_offline_progress(offline_elapsed)
+            if summary["elapsed"] >= OFFLINE_SUMMARY_MIN_SECONDS:
+                self.offline_summary = summary
+
+        # --- ASSETS ---
+        # Textures come from the shared AssetManager, so starting another game reloads nothing
+        self.assets = assets
+
+    @staticmethod
+    def get_plant_file(pid):
+        item = CATALOG.by_id.get(pid)
+        if item is not None:
+            return item.image
+        # Special case for "buy_plant" from old saves, which was historically "plant.png"
+        return "plant.png" if pid == "buy_plant" else f"{pid}.png"
+
+    def get_plant_image(self, pid, size=40):
+        """Plant texture at `size`, the shared fallback if its file is missing, None while loading."""
+        return self.assets.get(self.get_plant_file(pid), (size, size), fallback=True)
+
+    # --- ECONOMY VIEW ---
+    @property
+    def leafs(self):
+        return self.economy.leafs
+
+    @leafs.setter
+    def leafs(self, value):
+        self.economy.leafs = big(value)
+
+    @property
+    def plant_grid(self):
+        return self.economy.plant_grid
 
     @property
     def plants(self):
-        return len(self.plant_grid)
+        return self.economy.plants
+
+    @property
+    def season(self):
+        return self.economy.season
+
+    @property
+    def season_timer(self):
+        return self.economy.season_timer
+
+    @property
+    def upgrade_rate_bonus(self):
+        return self.economy.upgrade_rate_bonus
+
+    @property
+    def production_multiplier(self):
+        return self.economy.production_multiplier
+
+    @property
+    def just_changed_season(self):
+        return self.economy.just_changed_season
+
+    def apply_offline_progress(self, elapsed):
+        return self.economy.apply_offline_progress(elapsed)
 
     def get_plant_screen_pos(self, index):
         start_x, start_y = 60, 90
@@ -76,302 +91,374 @@ class GameManager:
         return x, y
 
     def update(self, dt):
-        self.just_changed_season = False
-
-        # Season Logic
-        self.season_timer += dt
-        if self.season_timer >= SEASON_DURATION:
-            self.season_timer = 0
-            curr_idx = self.seasons.index(self.season)
-            self.season = self.seasons[(curr_idx + 1) % 4]
-            self.season_change_timer = 3.0
-            self.just_changed_season = True  # Trigger music/bg change in Main
-
-        if self.season_change_timer > 0:
-            self.season_change_timer -= dt
-
-        # Rate Calculation
-        multiplier = {"Spring": 1.3, "Summer": 1.1, "Fall": 1.0, "Winter": 0.7}.get(self.season, 1.0)
-        base_rate = self.upgrade_rate_bonus
-        total_rate = base_rate * multiplier * self.production_multiplier
-        self.leafs += total_rate * dt
+        self.economy.update(dt)
 
     def get_stats(self):
-        multiplier = {"Spring": 1.3, "Summer": 1.1, "Fall": 1.0, "Winter": 0.7}.get(self.season, 1.0)
-        base_rate = self.upgrade_rate_bonus
-        rate = base_rate * multiplier * self.production_multiplier
-
-        return {
-            "leafs": int(self.leafs),
-            "plants": self.plants,
-            "season": self.season,
-            "rate": rate,
-            "season_visual_alpha": int((self.season_change_timer / 3.0) * 255) if self.season_change_timer > 0 else 0
-        }
+        return self.economy.get_stats()
 
     def get_save_data(self, shop_instance):
-        return {
-            "leafs": self.leafs,
-            "plants": self.plants,
-            "plant_grid": self.plant_grid,
-            "season": self.season,
-            "upgrade_rate_bonus": self.upgrade_rate_bonus,
-            "production_multiplier": self.production_multiplier,
-            "shop_state": shop_instance.get_state()
-        }
+        return self.economy.get_save_data()
+
+
+class PlantField:
+    """Cached plant layer for the planting area, with level of detail.
+
+    Close up the newest plants are sprites; zoomed all the way out the whole
+    garden becomes density tiles grouped by species, so any number of plants
+    costs the same to show. The layer is re-rendered only when the plant
+    count or zoom level changes; every other frame it is a single blit.
+    """
+
+    SPRITE_LEVELS = [(10, 40), (20, 16)]  # (columns and rows, sprite size) for the sprite zoom levels
+    TILE = 20
+
+    def __init__(self, game_mgr, rect):
+        self.game_mgr = game_mgr
+        self.rect = pygame.Rect(rect)
+        self.level = 0
+        self.surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.key = None
+
+        # Precomputed layer-local positions for every sprite slot
+        self.positions = []
+        for grid, size in self.SPRITE_LEVELS:
+            if grid == 10:
+                # Close up keeps the original 10x10 layout
+                slots = [self.game_mgr.get_plant_screen_pos(i) for i in range(grid * grid)]
+            else:
+                pitch_x, pitch_y = (WIDTH - 120) // grid, (HEIGHT - 200) // grid
+                slots = [(60 + c * pitch_x + (pitch_x - size) // 2, 90 + r * pitch_y + (pitch_y - size) // 2)
+                         for r in range(grid) for c in range(grid)]
+            self.positions.append([(x - self.rect.x, y - self.rect.y) for x, y in slots])
+
+        self.species_colors = {}
+
+    @property
+    def levels(self):
+        return len(self.SPRITE_LEVELS) + 1
+
+    def zoom(self, step):
+        """Positive steps zoom out. Returns True if the level changed."""
+        level = max(0, min(self.levels - 1, self.level + step))
+        changed = level != self.level
+        self.level = level
+        return changed
+
+    def get_key(self):
+        # Sprites still loading show up once the asset generation moves on
+        return self.level, len(self.game_mgr.plant_grid), self.game_mgr.assets.generation
+
+    def draw(self, screen):
+        key = self.get_key()
+        if key != self.key:
+            self.key = key
+            self.render()
+        screen.blit(self.surf, self.rect)
+
+    def render(self):
+        self.surf.fill((0, 0, 0, 0))
+        if self.level < len(self.SPRITE_LEVELS):
+            self.render_sprites()
+        else:
+            self.render_density()
+
+    def render_sprites(self):
+        grid, size = self.SPRITE_LEVELS[self.level]
+        positions = self.positions[self.level]
+        batch = []
+        for pos, item_id in zip(positions, self.game_mgr.plant_grid.most_recent(grid * grid)):
+            img = self.game_mgr.get_plant_image(item_id, size)
+            if img:
+                batch.append((img, pos))
+        self.surf.blits(batch, doreturn=False)
+
+    def get_species_color(self, pid):
+        color = self.species_colors.get(pid)
+        if color is None:
+            img = self.game_mgr.get_plant_image(pid)
+            if img is None:
+                return 255, 0, 255  # Still loading, not cached
+            color = self.species_colors[pid] = pygame.transform.average_color(img)[:3]
+        return color
+
+    def render_density(self):
+        """Every plant, as tiles that each stand for the same number of plants, grouped by species."""
+        tile = self.TILE
+        cols = (self.rect.width - tile) // tile
+        rows = (self.rect.height - tile) // tile
+        grid = self.game_mgr.plant_grid
+        per_tile = max(1, -(-len(grid) // (cols * rows)))
+        # Each species rounds its own partial tile up, which can overflow the grid by one tile per species
+        while sum(-(-count // per_tile) for count in grid.counts.values()) > cols * rows:
+            per_tile += 1
+
+        batch = []
+        slot = 0
+        for pid, count in grid.counts.items():
+            color = self.get_species_color(pid)
+            full, rest = divmod(count, per_tile)
+            swatch = pygame.Surface((tile - 2, tile - 2))
+            swatch.fill(color)
+            for _ in range(full):
+                r, c = divmod(slot, cols)
+                batch.append((swatch, (tile // 2 + c * tile, tile // 2 + r * tile)))
+                slot += 1
+            if rest:
+                # A partly filled tile fades with how full it is
+                partial = swatch.copy()
+                partial.set_alpha(60 + 195 * rest // per_tile)
+                r, c = divmod(slot, cols)
+                batch.append((partial, (tile // 2 + c * tile, tile // 2 + r * tile)))
+                slot += 1
+        self.surf.blits(batch, doreturn=False)
+
+        label = render_text(get_font(24), f"1 tile = {per_tile} plants", (200, 200, 200))
+        self.surf.blit(label, label.get_rect(bottomright=(self.rect.width - 10, self.rect.height - 4)))
 
 
 class Shop:
-    def __init__(self):
+    ROW_H = 80
+    ROW_PITCH = 90  # Row height plus spacing
+
+    def __init__(self, economy):
+        self.economy = economy
         self.is_open = False
         self.is_upgrades = False
         self.rect = None
         self.close_rect = None
         self.close_hovered = False
 
-        self.shop_items = [
-            {"id": "maple_sapling", "name": "Maple Sapling", "cost": 10, "desc": "+0.5 Leaf/sec", "rate_boost": 0.5,
-             "cost_mult": 1.1, "count": 0},
-            {"id": "oak_tree", "name": "Oak Tree", "cost": 100, "desc": "+5 Leaf/sec", "rate_boost": 5.0,
-             "cost_mult": 1.2, "count": 0},
-            {"id": "willow_tree", "name": "Weeping Willow", "cost": 1000, "desc": "+25 Leaf/sec", "rate_boost": 25.0,
-             "cost_mult": 1.3, "count": 0},
-            {"id": "ginkgo_tree", "name": "Ginkgo Tree", "cost": 7500, "desc": "+100 Leaf/sec", "rate_boost": 100.0,
-             "cost_mult": 1.4, "count": 0},
-            {"id": "ancient_banyan", "name": "Ancient Banyan", "cost": 50000, "desc": "+500 Leaf/sec",
-             "rate_boost": 500.0, "cost_mult": 1.5, "count": 0},
-            {"id": "crystal_tree", "name": "Crystal Tree", "cost": 500000, "desc": "+5000 Leaf/sec",
-             "rate_boost": 5000.0, "cost_mult": 1.5, "count": 0},
-            {"id": "spirit_blossom", "name": "Spirit Blossom", "cost": 1000000, "desc": "+10000 Leaf/sec",
-             "rate_boost": 10000.0, "cost_mult": 1.5, "count": 0},
-
-            # --- INFLATION RESET ITEM ---
-            {"id": "inflation_reset", "name": "Market Crash", "cost": 100000, "desc": "Reset shop costs to default.",
-             "rate_boost": 0.0, "cost_mult": 20.0, "count": 0}
-        ]
-
-        for item in self.shop_items:
-            item["base_cost"] = item["cost"]
-
-        self.upgrade_items = [
-            {"id": "rate_10%", "name": "Fertilizer", "cost": 100, "desc": "Output +10%", "multiplier_value": 1.1,
-             "purchased": False},
-            {"id": "rate_20%", "name": "Sprinkler", "cost": 500, "desc": "Output +20%", "multiplier_value": 1.2,
-             "purchased": False},
-            {"id": "rate_30%", "name": "Rich Compost", "cost": 2500, "desc": "Output +30%", "multiplier_value": 1.3,
-             "purchased": False},
-            {"id": "rate_50%", "name": "Magic Pollen", "cost": 15000, "desc": "Output +50%", "multiplier_value": 1.5,
-             "purchased": False},
-            {"id": "rate_100%", "name": "Holy Water", "cost": 250000, "desc": "Output x2", "multiplier_value": 2.0,
-             "purchased": False},
-            {"id": "rate_300%", "name": "Terra Mater", "cost": 5000000, "desc": "Output x4", "multiplier_value": 4.0,
-             "purchased": False},
-            {"id": "rate_700%", "name": "Gaia's Bless", "cost": 1000000000, "desc": "Output x8",
-             "multiplier_value": 8.0, "purchased": False},
-            {"id": "rate_1500%", "name": "Mother of all Nature", "cost": 1000000000000, "desc": "Output x16",
-             "multiplier_value": 16.0, "purchased": False}
-        ]
+        # Bulk buy mode for plants, cycled by the button opposite CLOSE
+        self.bulk_index = 0
+        self.bulk_rect = None
+        self.bulk_hovered = False
+        self.quotes = {}  # Item id -> (cost, bulk_index, low, high, quote); valid while low <= leafs < high
+
+        # Cached modal surfaces, rebuilt only when what they show changes
+        self.overlay = None
+        self.list_rect = None
+        self.frame_surf = None
+        self.frame_key = None
+        self.rows = None  # VirtualList of the open list's rows, made by layout()
+
+        # Row of the open list under the mouse, set by check_hover
+        self.hovered_row = None
+
+    @property
+    def bulk_amount(self):
+        return BULK_MODES[self.bulk_index]
+
+    def get_bulk_quote(self, item, leafs):
+        """(count, total) one click on `item` would buy at the current bulk mode."""
+        if self.is_upgrades or item.defn.single or self.bulk_amount == 1:
+            return 1, item.cost
+        cached = self.quotes.get(item.defn.id)
+        if cached and cached[0] == item.cost and cached[1] == self.bulk_index and cached[2] <= leafs < cached[3]:
+            return cached[4]
+
+        amount = self.bulk_amount
+        if amount is None:
+            # MAX stays the same until leafs afford one more or drop below what it costs
+            count, total, next_cost = self.economy.quote(item.defn.id, None, leafs)
+            low, high = total, total + next_cost
+        else:
+            count, total, _ = self.economy.quote(item.defn.id, amount)
+            low, high = float("-inf"), float("inf")
+        quote = (1, item.cost) if count == 0 else (count, total)
+        self.quotes[item.defn.id] = (item.cost, self.bulk_index, low, high, quote)
+        return quote
+
+    @property
+    def shop_items(self):
+        return self.economy.shop_items
+
+    @property
+    def upgrade_items(self):
+        return self.economy.upgrade_items
 
     def get_state(self):
-        return {
-            "shop_items": [{"id": i["id"], "cost": i["cost"]} for i in self.shop_items],
-            "upgrade_items": [{"id": i["id"], "purchased": i.get("purchased", False)} for i in self.upgrade_items]
-        }
+        return self.economy.get_state()
 
     def load_state(self, data):
-        if not data: return
-        saved_costs = {item["id"]: item["cost"] for item in data.get("shop_items", [])}
-        for item in self.shop_items:
-            if item["id"] in saved_costs:
-                item["cost"] = saved_costs[item["id"]]
+        self.economy.load_state(data)
 
-        saved_upgrades = {item["id"]: item["purchased"] for item in data.get("upgrade_items", [])}
-        for item in self.upgrade_items:
-            if item["id"] in saved_upgrades:
-                item["purchased"] = saved_upgrades[item["id"]]
+    @property
+    def current_list(self):
+        return self.upgrade_items if self.is_upgrades else self.shop_items
 
     def toggle(self, is_upgrades=False):
         self.is_open = True
         self.is_upgrades = is_upgrades
-
-    def recalculate_cost(self, num_plants):
-        pass
+        self.hovered_row = None
+        self.layout(WIDTH, HEIGHT)  # Hit-testable before the first draw
+        self.rows.reset(len(self.current_list))
 
     def get_max_scroll(self, width, height):
-        modal_h = 500
-        item_h = 80
-        spacing = 10
-        current_list = self.upgrade_items if self.is_upgrades else self.shop_items
-        content_h = len(current_list) * (item_h + spacing)
-        visible_h = modal_h - 150
-        max_scroll = max(0, content_h - visible_h)
-        return max_scroll
+        self.layout(width, height)
+        return self.rows.max_scroll
 
     def get_scrollbar_info(self, width, height, scroll_offset):
-        modal_w, modal_h = 700, 500
-        rect = pygame.Rect(0, 0, modal_w, modal_h)
-        rect.center = (width // 2, height // 2)
-
-        item_h = 80
-        spacing = 10
-        current_list = self.upgrade_items if self.is_upgrades else self.shop_items
-        content_h = len(current_list) * (item_h + spacing)
-        visible_h = modal_h - 150
-        max_scroll = max(0, content_h - visible_h)
-        track_rect = pygame.Rect(rect.right - 30, rect.top + 100, 12, visible_h)
-
-        if content_h <= visible_h:
-            return track_rect, None, max_scroll
-
-        thumb_h = max(20, int(visible_h * (visible_h / content_h)))
-        track_space = visible_h - thumb_h
-        thumb_top = track_rect.top if max_scroll == 0 else track_rect.top + int(
-            (scroll_offset / max_scroll) * track_space)
-        thumb_rect = pygame.Rect(track_rect.x, thumb_top, track_rect.width, thumb_h)
-        return track_rect, thumb_rect, max_scroll
+        self.layout(width, height)
+        return self.rows.track_rect, self.rows.get_thumb_rect(scroll_offset), self.rows.max_scroll
 
     def draw(self, screen, width, height, leafs, scroll_offset=0):
         if not self.is_open: return
-
-        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, (0, 0))
-
+        self.layout(width, height)
+
+        if self.overlay is None or self.overlay.get_size() != (width, height):
+            self.overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+            self.overlay.fill((0, 0, 0, 180))
+        screen.blit(self.overlay, (0, 0))
+
+        # Modal frame: panel, title and the two header buttons
+        frame_key = self.get_frame_key()
+        if frame_key != self.frame_key:
+            self.frame_key = frame_key
+            self.build_frame()
+        screen.blit(self.frame_surf, self.rect)
+
+        # Item rows: only the ones in view exist, and only those whose key changed are redrawn
+        self.rows.draw(screen, scroll_offset, lambda i: self.get_row_key(i, leafs))
+
+    def get_view_key(self, leafs, scroll_offset):
+        """Changes whenever the open shop would draw differently."""
+        first, last = self.rows.get_visible_range(scroll_offset)
+        rows = tuple(self.get_row_key(i, leafs) for i in range(first, last))
+        return self.get_frame_key(), int(scroll_offset), rows
+
+    def get_frame_key(self):
+        return self.is_upgrades, self.close_hovered, self.bulk_hovered, self.bulk_index
+
+    def get_row_key(self, index, leafs):
+        """What a row shows: its label, colour and hover state. Leafs only matter at affordability edges."""
+        item = self.current_list[index]
+        count, total = self.get_bulk_quote(item, leafs)
+        return item.purchased, count, total, leafs >= total, index == self.hovered_row
+
+    def layout(self, width, height):
+        if self.rect and self.rect.center == (width // 2, height // 2):
+            return
         self.rect = pygame.Rect(0, 0, 700, 500)
         self.rect.center = (width // 2, height // 2)
-        pygame.draw.rect(screen, (40, 40, 50), self.rect, border_radius=15)
-        pygame.draw.rect(screen, (144, 238, 144), self.rect, 4, border_radius=15)
+        self.list_rect = pygame.Rect(self.rect.left + 50, self.rect.top + 100, self.rect.width - 100,
+                                     self.rect.height - 150)
+        self.close_rect = pygame.Rect(0, 0, 100, 40)
+        self.close_rect.topleft = (self.rect.left + 20, self.rect.top + 20)
+        self.bulk_rect = pygame.Rect(0, 0, 100, 40)  # Only shown and clickable in the plant shop
+        self.bulk_rect.topright = (self.rect.right - 20, self.rect.top + 20)
+
+        track_rect = pygame.Rect(self.rect.right - 30, self.list_rect.top, 12, self.list_rect.height)
+        self.rows = VirtualList(self.list_rect, self.ROW_H, self.ROW_PITCH, track_rect,
+                                lambda surf, i, key: self.draw_row(surf, self.current_list[i], key), (40, 40, 50))
+        self.rows.reset(len(self.current_list))
+
+    def build_frame(self):
+        if self.frame_surf is None:
+            self.frame_surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        surf = self.frame_surf
+        surf.fill((0, 0, 0, 0))
+        local = surf.get_rect()
+        pygame.draw.rect(surf, (40, 40, 50), local, border_radius=15)
+        pygame.draw.rect(surf, (144, 238, 144), local, 4, border_radius=15)
 
-        font = pygame.font.Font(None, 48)
         title_text = "UPGRADES" if self.is_upgrades else "PLANT SHOP"
-        title = font.render(title_text, True, (255, 255, 255))
-        screen.blit(title, title.get_rect(center=(self.rect.centerx, self.rect.top + 50)))
-
-        current_list = self.upgrade_items if self.is_upgrades else self.shop_items
-        item_start_y = self.rect.top + 100
-        btn_font = pygame.font.Font(None, 32)
-        desc_font = pygame.font.Font(None, 24)
-
-        modal_h = self.rect.height
-        visible_h = modal_h - 150
-        clip_rect = pygame.Rect(self.rect.left + 50, self.rect.top + 100, self.rect.width - 100, visible_h)
-        prev_clip = screen.get_clip()
-        screen.set_clip(clip_rect)
-
-        for i, item in enumerate(current_list):
-            item_h = 80
-            item_y = item_start_y + (i * (item_h + 10))
-            item_rect = pygame.Rect(self.rect.left + 50, item_y, self.rect.width - 100, item_h)
-            offset_rect = item_rect.move(0, -scroll_offset)
-            item["rect"] = offset_rect
-
-            is_bought = item.get("purchased", False) and item.get("multiplier_value")
-            can_afford = leafs >= item["cost"]
-
-            if is_bought:
-                base_col = (50, 50, 50)
-            else:
-                base_col = (70, 130, 70) if can_afford else (80, 80, 80)
-                if item.get("hovered"): base_col = (100, 160, 100) if can_afford else (100, 100, 100)
-
-            # Inflation Reset Color
-            if item["id"] == "inflation_reset":
-                base_col = (150, 80, 80) if can_afford else (100, 60, 60)
-                if item.get("hovered") and can_afford: base_col = (180, 90, 90)
-
-            pygame.draw.rect(screen, base_col, offset_rect, border_radius=8)
-            pygame.draw.rect(screen, (200, 200, 200), offset_rect, 2, border_radius=8)
-
-            if is_bought:
-                name_txt = btn_font.render(f"{item['name']} - OWNED", True, (150, 150, 150))
-            else:
-                name_txt = btn_font.render(f"{item['name']} - {item['cost']} Leafs", True, (255, 255, 255))
+        title = render_text(get_font(48), title_text, (255, 255, 255))
+        surf.blit(title, title.get_rect(center=(local.centerx, 50)))
 
-            screen.blit(name_txt, (offset_rect.x + 20, offset_rect.y + 15))
-            desc_txt = desc_font.render(item['desc'], True, (200, 200, 200))
-            screen.blit(desc_txt, (offset_rect.x + 20, offset_rect.y + 45))
-
-        screen.set_clip(prev_clip)
-
-        self.close_rect = pygame.Rect(0, 0, 100, 40)
-        self.close_rect.topleft = (self.rect.left + 20, self.rect.top + 20)
+        btn_font = get_font(32)
+        close_rect = self.close_rect.move(-self.rect.left, -self.rect.top)
         close_col = (200, 80, 80) if self.close_hovered else (180, 70, 70)
-        pygame.draw.rect(screen, close_col, self.close_rect, border_radius=8)
-
-        txt_close = btn_font.render("CLOSE", True, (255, 255, 255))
-        screen.blit(txt_close, txt_close.get_rect(center=self.close_rect.center))
+        pygame.draw.rect(surf, close_col, close_rect, border_radius=8)
+        txt_close = render_text(btn_font, "CLOSE", (255, 255, 255))
+        surf.blit(txt_close, txt_close.get_rect(center=close_rect.center))
+
+        if not self.is_upgrades:
+            bulk_rect = self.bulk_rect.move(-self.rect.left, -self.rect.top)
+            bulk_col = (100, 160, 100) if self.bulk_hovered else (70, 130, 70)
+            pygame.draw.rect(surf, bulk_col, bulk_rect, border_radius=8)
+            bulk_label = "MAX" if self.bulk_amount is None else f"x{self.bulk_amount}"
+            txt_bulk = render_text(btn_font, bulk_label, (255, 255, 255))
+            surf.blit(txt_bulk, txt_bulk.get_rect(center=bulk_rect.center))
+
+    def draw_row(self, surf, item, row_key):
+        is_bought, count, total, can_afford, hovered = row_key
+        row_rect = surf.get_rect()
+
+        if is_bought:
+            base_col = (50, 50, 50)
+        else:
+            base_col = (70, 130, 70) if can_afford else (80, 80, 80)
+            if hovered: base_col = (100, 160, 100) if can_afford else (100, 100, 100)
+
+        # Inflation Reset Color
+        if item.defn.kind == "crash":
+            base_col = (150, 80, 80) if can_afford else (100, 60, 60)
+            if hovered and can_afford: base_col = (180, 90, 90)
+
+        pygame.draw.rect(surf, base_col, row_rect, border_radius=8)
+        pygame.draw.rect(surf, (200, 200, 200), row_rect, 2, border_radius=8)
+
+        btn_font = get_font(32)
+        if is_bought:
+            name_txt = render_text(btn_font, f"{item.defn.name} - OWNED", (150, 150, 150))
+        elif count > 1:
+            name_txt = render_text(btn_font, f"{item.defn.name} x{count} - {format_short(total)} Leafs", (255, 255, 255))
+        else:
+            name_txt = render_text(btn_font, f"{item.defn.name} - {format_short(total)} Leafs", (255, 255, 255))
 
-        track_rect, thumb_rect, max_scroll = self.get_scrollbar_info(width, height, scroll_offset)
-        if thumb_rect:
-            pygame.draw.rect(screen, (80, 80, 90), track_rect, border_radius=6)
-            pygame.draw.rect(screen, (160, 160, 160), thumb_rect, border_radius=6)
-            pygame.draw.rect(screen, (220, 220, 220), thumb_rect, 2, border_radius=6)
+        surf.blit(name_txt, (row_rect.x + 20, row_rect.y + 15))
+        desc_txt = render_text(get_font(24), item.defn.desc, (200, 200, 200))
+        surf.blit(desc_txt, (row_rect.x + 20, row_rect.y + 45))
 
-    def check_hover(self, pos, sound_mgr):
+    def check_hover(self, pos, sound_mgr, scroll_offset=0):
+        """Moves the hover state to what is under `pos`. Called on mouse events, not every frame."""
         if not self.is_open: return
+        target = self.hit_test(pos, scroll_offset)
+        row = target if isinstance(target, int) else None
+        if target is not None and target != self.get_hovered():
+            sound_mgr.play("hover")
+        self.close_hovered = target == "close"
+        self.bulk_hovered = target == "bulk"
+        self.hovered_row = row
+
+    def get_hovered(self):
+        return "close" if self.close_hovered else "bulk" if self.bulk_hovered else self.hovered_row
+
+    def hit_test(self, pos, scroll_offset=0):
+        """What is under `pos`: "close", "bulk", the index of a row in the open list, or None."""
         if self.close_rect and self.close_rect.collidepoint(pos):
-            if not self.close_hovered: sound_mgr.play("hover")
-            self.close_hovered = True
-        else:
-            self.close_hovered = False
-
-        if self.rect:
-            modal_h = self.rect.height
-            visible_h = modal_h - 150
-            clip_rect = pygame.Rect(self.rect.left + 50, self.rect.top + 100, self.rect.width - 100, visible_h)
-        else:
-            return
-
-        current_list = self.upgrade_items if self.is_upgrades else self.shop_items
-        for item in current_list:
-            if "rect" in item:
-                # Check Visible Area
-                is_visible = clip_rect.collidepoint(pos)
-                was_hover = item.get("hovered", False)
-                item["hovered"] = item["rect"].collidepoint(pos) and is_visible
+            return "close"
+        if not self.is_upgrades and self.bulk_rect and self.bulk_rect.collidepoint(pos):
+            return "bulk"
+        return self.get_row_at(pos, scroll_offset)
 
-                if item["hovered"] and not was_hover:
-                    sound_mgr.play("hover")
+    def get_row_at(self, pos, scroll_offset=0):
+        """Index of the visible row under `pos`, or None. O(1) however long the list is."""
+        return self.rows.row_at(pos, scroll_offset) if self.rows else None
 
-    def handle_click(self, pos, current_leafs, sound_mgr):
-        if not self.is_open: return current_leafs, False, 0, None, 1.0
+    def handle_click(self, pos, sound_mgr, scroll_offset=0):
+        """Buys the clicked item through the economy. Returns the bought item id or None."""
+        if not self.is_open: return None
 
-        if self.close_rect and self.close_rect.collidepoint(pos):
+        target = self.hit_test(pos, scroll_offset)
+        if target == "close":
             sound_mgr.play("back")
             self.is_open = False
-            return current_leafs, False, 0, None, 1.0
-
-        modal_h = self.rect.height
-        visible_h = modal_h - 150
-        clip_rect = pygame.Rect(self.rect.left + 50, self.rect.top + 100, self.rect.width - 100, visible_h)
-
-        current_list = self.upgrade_items if self.is_upgrades else self.shop_items
-        for item in current_list:
-            if "rect" in item and item["rect"].collidepoint(pos) and clip_rect.collidepoint(pos):
-                if item.get("purchased", False):
-                    sound_mgr.play("error")
-                    return current_leafs, False, 0, None, 1.0
-
-                if current_leafs >= item["cost"]:
-                    sound_mgr.play("select")
-                    new_leafs = current_leafs - item["cost"]
-
-                    if item["id"] == "inflation_reset":
-                        item["cost"] = int(item["cost"] * item.get("cost_mult", 1.5))
-                        for s_item in self.shop_items:
-                            if s_item["id"] != "inflation_reset":
-                                s_item["cost"] = s_item["base_cost"]
-                        return new_leafs, False, 0, None, 1.0
-
-                    item["cost"] = int(item["cost"] * item.get("cost_mult", 1.1))
-                    item_id = item["id"]
-                    mult_val = item.get("multiplier_value", 1.0)
-                    rate_boost = item.get("rate_boost", 0)
-
-                    if mult_val > 1.0:
-                        item["purchased"] = True
-                        return new_leafs, False, 0, item_id, mult_val
-                    else:
-                        return new_leafs, True, rate_boost, item_id, 1.0
-
-        return current_leafs, False, 0, None, 1.0
\ No newline at end of file
+            return None
+
+        if target == "bulk":
+            sound_mgr.play("select")
+            self.bulk_index = (self.bulk_index + 1) % len(BULK_MODES)
+            return None
+
+        if target is None: return None
+        item = self.current_list[target]
+        if item.purchased:
+            sound_mgr.play("error")
+            return None
+
+        amount = 1 if self.is_upgrades else self.bulk_amount
+        if self.economy.buy(item.defn.id, amount):
+            sound_mgr.play("select")
+            return item.defn.id
+        return None
@@ -1,13 +1,36 @@
+import argparse
 import pygame
 import sys
 import os
-from settings import WIDTH, HEIGHT, FPS, BG_COLOR, TEXT_COLOR, GAME_UI_BG, PLANTING_AREA_COLOR, ASSETS_DIR
-from managers import SoundManager, MusicManager, SaveManager, SettingsManager
-from game_logic import GameManager, Shop
-from ui import Button, Slider
+from settings import WIDTH, HEIGHT, FPS, BG_COLOR, TEXT_COLOR, GAME_UI_BG, PLANTING_AREA_COLOR, ASSETS_DIR, \
+    DIRTY_RECT_RENDERING, BACKGROUND_FPS, MINIMIZED_WAIT_MS, STATIC_SCREEN_WAIT_MS, SEASONS, SEASON_DURATION, \
+    SEASON_PREFETCH_SECONDS, SAVE_FILE, LEGACY_SAVE_FILE, JOURNAL_FILE, SETTINGS_FILE
+from managers import SoundManager, MusicManager, SaveManager, SettingsManager, AutoSaver, AssetManager, ASSET_LOADED
+from game_logic import GameManager, Shop, PlantField
+from ui import Button, Slider, HitGrid
+from fonts import get_font, render_text
+from profiler import FrameProfiler
+from bignum import format_short
+from catalog import CATALOG
+from replay import InputRecorder
 
 
 class Game:
+    MENU_BG = "menu_bg.png"
+    SEASON_BGS = {
+        "Spring": "game_spring_bg.png",
+        "Summer": "game_summer_bg.png",
+        "Fall": "game_fall_bg.png",
+        "Winter": "game_winter_bg.png"
+    }
+    ICONS = {"season": "season_icon.png", "rate": "rate_icon.png", "leaf": "leaf_icon.png"}
+    SEASON_TRACKS = {
+        "Spring": "music_spring.mp3",
+        "Summer": "music_summer.mp3",
+        "Fall": "music_fall.mp3",
+        "Winter": "music_winter.mp3"
+    }
+
     def __init__(self):
         pygame.init()
         pygame.mixer.init()
@@ -21,50 +44,32 @@ class Game:
         except:
             pass
 
-        # --- BACKGROUND LOADING (With Seasons) ---
-        self.backgrounds = {}
-        self.menu_bg = None
+        # --- ASSETS ---
+        # Decoded on the asset thread; until then the screens draw their plain fallbacks
+        self.assets = AssetManager()
+        self.assets.request(self.MENU_BG, (WIDTH, HEIGHT), alpha=False)
+        for name in self.ICONS.values():
+            self.assets.request(name, (32, 32))
+        for item in CATALOG.plants:
+            self.assets.request(item.image, (40, 40))
+
+        # --- BACKGROUNDS (With Seasons) ---
+        self.season_composites = {}  # Season -> [background + static game layers, background baked in]
         self.current_bg = None
         self.next_bg = None  # For fading
         self.bg_fade_alpha = 0
 
-        # Helper to safely load backgrounds
-        def load_bg(name):
-            try:
-                img = pygame.image.load(os.path.join(ASSETS_DIR, name)).convert()
-                return pygame.transform.scale(img, (WIDTH, HEIGHT))
-            except:
-                return None
-
-        self.menu_bg = load_bg("menu_bg.png")
-        self.backgrounds["Spring"] = load_bg("game_spring_bg.png")
-        self.backgrounds["Summer"] = load_bg("game_summer_bg.png")
-        self.backgrounds["Fall"] = load_bg("game_fall_bg.png")
-        self.backgrounds["Winter"] = load_bg("game_winter_bg.png")
-
-        # UI ICONS
-        self.icons = {}
-
-        def load_icon(name):
-            path = os.path.join(ASSETS_DIR, name)
-            if os.path.exists(path):
-                img = pygame.image.load(path).convert_alpha()
-                return pygame.transform.scale(img, (32, 32))
-            return None
-
-        self.icons["season"] = load_icon("season_icon.png")
-        self.icons["rate"] = load_icon("rate_icon.png")
-        self.icons["leaf"] = load_icon("leaf_icon.png")
-
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 32)
-        self.large_font = pygame.font.Font(None, 64)
+        self.profiler = FrameProfiler()  # F3 overlay, F4 CSV recording
+        self.font = get_font(32)
+        self.large_font = get_font(64)
 
         # Managers
         self.settings_mgr = SettingsManager()
         self.sound_mgr = SoundManager(self.settings_mgr)
         self.music_mgr = MusicManager(self.settings_mgr)
         self.save_mgr = SaveManager()
+        self.autosaver = AutoSaver(self.save_mgr)
 
         # Load Sounds (Two variations of hover)
         self.sound_mgr.load_sound("select", "Item_Accept.wav")
@@ -77,15 +82,38 @@ class Game:
         # Game Objects
         self.game_mgr = None
         self.shop = None
+        self.plant_field = None
         self.shop_scroll = 0
         self.shop_scroll_dragging = False
         self.shop_scroll_drag_offset = 0
+        self.welcome_back = None  # (title, lines) shown after loading: offline progress or a damaged save
 
         self.state = "PRESCREEN"
         self.prev_state = "MENU"
         self.flash_timer = 0
         self.setup_ui()
 
+        # --- DIRTY RECT RENDERING ---
+        # Only regions whose content key changed since the last frame are redrawn and pushed
+        self.dirty_rendering = DIRTY_RECT_RENDERING
+        self.prev_regions = None
+        self.full_redraw = True
+        self.screen_rect = self.screen.get_rect()
+        self.top_bar_rect = pygame.Rect(0, 0, WIDTH, 62)
+        self.plant_field_rect = pygame.Rect(50, 80, WIDTH - 100, HEIGHT - 180)
+        self.stat_bar_rect = pygame.Rect(0, HEIGHT - 80, WIDTH, 80)
+        self.season_overlay_rect = pygame.Rect(0, HEIGHT // 2 - 50, WIDTH, 100)
+
+        # --- FRAME PACING ---
+        # Unfocused or minimized windows run slower; screens that only change on input block for it
+        self.window_focused = True
+        self.window_visible = True
+
+        # --- RECORDING / REPLAY ---
+        # See replay.py. A player replaces the event queue and the clock
+        self.recorder = None
+        self.player = None
+
         # Start Menu Music
         self.music_mgr.play_music("menu_music.mp3")
 
@@ -106,9 +134,89 @@ class Game:
             Button(300, 10, 120, 40, "UPGRADES", "game_upgrades", font_size=24)
         ]
 
+        # --- HIT TESTING ---
+        # Hover moves on mouse events (or when the screen under the cursor changes), never per frame
+        self.hit_grids = {
+            "MENU": HitGrid(self.menu_buttons),
+            "SETTINGS": HitGrid([self.settings_back_btn]),
+            "GAME": HitGrid(self.game_buttons)
+        }
+        self.hovered_button = None
+        self.hover_key = None
+        self.mouse_pos = pygame.mouse.get_pos()  # Last position a mouse event reported
+
+    @classmethod
+    def get_asset_manifest(cls):
+        """Every (file, size, alpha) the game loads; `python assetcache.py` pre-scales these."""
+        manifest = [(cls.MENU_BG, (WIDTH, HEIGHT), False)]
+        manifest += [(name, (WIDTH, HEIGHT), False) for name in cls.SEASON_BGS.values()]
+        manifest += [(name, (32, 32), True) for name in cls.ICONS.values()]
+        for item in CATALOG.plants:
+            for _, size in PlantField.SPRITE_LEVELS:
+                manifest.append((item.image, (size, size), True))
+        return manifest
+
+    def get_season_composite(self, season):
+        """Season background with the top bar and planting area baked in, as one opaque surface.
+
+        None of these layers change between season changes, so draw_game
+        gets its whole base in a single blit. While the background is still
+        loading the composite uses the plain fill, and is repainted in place
+        once it arrives.
+        """
+        entry = self.season_composites.get(season)
+        if entry and entry[1]:
+            return entry[0]
+
+        bg = self.assets.get(self.SEASON_BGS[season], (WIDTH, HEIGHT), alpha=False)
+        if entry and not bg:
+            return entry[0]
+        if not entry:
+            entry = self.season_composites[season] = [pygame.Surface((WIDTH, HEIGHT)).convert(), False]
+        composite = entry[0]
+        entry[1] = bg is not None
+        if bg:
+            composite.blit(bg, (0, 0))
+        else:
+            composite.fill(BG_COLOR)  # Fallback
+
+        # Top Bar
+        pygame.draw.rect(composite, GAME_UI_BG, (0, 0, WIDTH, 60))
+        pygame.draw.line(composite, TEXT_COLOR, (0, 60), (WIDTH, 60), 2)
+
+        # Planting Area (Transparent)
+        plant_area_surf = pygame.Surface((WIDTH - 100, HEIGHT - 180), pygame.SRCALPHA)
+        r, g, b = PLANTING_AREA_COLOR
+        plant_area_surf.fill((r, g, b, 180))
+        composite.blit(plant_area_surf, (50, 80))
+        pygame.draw.rect(composite, (80, 100, 80), (50, 80, WIDTH - 100, HEIGHT - 180), 2, border_radius=10)
+        return composite
+
+    def get_upcoming_seasons(self, count):
+        idx = SEASONS.index(self.game_mgr.season)
+        return [SEASONS[(idx + i) % len(SEASONS)] for i in range(count)]
+
+    def prepare_season_composites(self):
+        """Keeps only the composites for this season and the next, building that one ahead of its fade.
+
+        Once the season is about to end the one after is built too, so the
+        season change itself never has to build a composite.
+        """
+        near_end = self.game_mgr.season_timer >= SEASON_DURATION - SEASON_PREFETCH_SECONDS
+        keep = self.get_upcoming_seasons(3 if near_end else 2)
+        for name in list(self.season_composites):
+            if name not in keep:
+                del self.season_composites[name]
+        for name in keep:
+            self.get_season_composite(name)
+
+    def get_menu_bg(self):
+        return self.assets.get(self.MENU_BG, (WIDTH, HEIGHT), alpha=False)
+
     def update_background(self, season):
         """Logic to switch backgrounds smoothly"""
-        target_bg = self.backgrounds.get(season)
+        self.prepare_season_composites()
+        target_bg = self.get_season_composite(season)
         if self.current_bg != target_bg and self.next_bg != target_bg:
             if self.current_bg is None:
                 self.current_bg = target_bg
@@ -118,24 +226,111 @@ class Game:
 
     def update_music(self, season):
         """Logic to switch music based on season"""
-        # Mapping season name to filename
-        track_map = {
-            "Spring": "music_spring.mp3",
-            "Summer": "music_summer.mp3",
-            "Fall": "music_fall.mp3",
-            "Winter": "music_winter.mp3"
-        }
-        filename = track_map.get(season, "game_music.mp3")
+        filename = self.SEASON_TRACKS.get(season, "game_music.mp3")
         self.music_mgr.play_music(filename, fade_ms=2000)
 
+    def prefetch_season(self):
+        """Readies the next season's music and backgrounds before this one ends, so the change costs no frame time."""
+        if self.game_mgr.season_timer < SEASON_DURATION - SEASON_PREFETCH_SECONDS:
+            return
+        _, next_season, after_next = self.get_upcoming_seasons(3)
+        self.music_mgr.prefetch(self.SEASON_TRACKS[next_season])
+        if after_next not in self.season_composites:
+            self.prepare_season_composites()
+
+    def get_idle_wait(self):
+        """Milliseconds handle_input may block waiting for events; 0 means poll.
+
+        Time spent blocked still shows up in the next clock.tick, so the
+        economy advances by the real elapsed time either way.
+        """
+        if not self.window_visible:
+            return MINIMIZED_WAIT_MS
+        if self.state == "PRESCREEN":
+            # Wake up in time for the next blink of the prompt
+            return 500 - int(self.flash_timer) % 500
+        if self.state in ("MENU", "SETTINGS"):
+            return STATIC_SCREEN_WAIT_MS
+        return 0
+
+    def start_recording(self, path):
+        """Logs every frame's input and dt to `path`, starting from the save files as they are now."""
+        self.recorder = InputRecorder(path, (SAVE_FILE, LEGACY_SAVE_FILE, JOURNAL_FILE, SETTINGS_FILE),
+                                      self.mouse_pos)
+
+    def get_events(self):
+        if self.player:
+            pygame.event.clear()  # Only recorded input counts; nothing blocks
+            return self.player.next_events()
+        wait_ms = self.get_idle_wait()
+        if not wait_ms:
+            return pygame.event.get()
+        with self.profiler.phase("wait"):
+            event = pygame.event.wait(wait_ms)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        return events + pygame.event.get()
+
+    def get_button_at(self, pos):
+        grid = self.hit_grids.get(self.state)
+        if grid is None or (self.state == "GAME" and (self.shop.is_open or self.welcome_back)):
+            return None  # Covered by a modal
+        return grid.hit(pos)
+
+    def update_hover(self, pos):
+        """Hit-tests `pos` once and moves every hover state to match."""
+        button = self.get_button_at(pos)
+        if button is not self.hovered_button:
+            if self.hovered_button:
+                self.hovered_button.set_hovered(False, self.sound_mgr)
+            if button:
+                button.set_hovered(True, self.sound_mgr)
+            self.hovered_button = button
+        if self.state == "GAME" and self.shop.is_open:
+            self.shop.check_hover(pos, self.sound_mgr, self.shop_scroll)
+
+    def get_hover_key(self):
+        """Changes when what lies under a still cursor may have changed."""
+        if self.state != "GAME":
+            return self.state
+        return self.state, self.welcome_back is None, self.shop.is_open, self.shop.is_upgrades, int(self.shop_scroll)
+
     def handle_input(self):
-        events = pygame.event.get()
-        mouse_pos = pygame.mouse.get_pos()
+        events = self.get_events()
+        if self.recorder:
+            self.recorder.capture(events)
+        mouse_moved = False
 
         for event in events:
+            if event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEWHEEL):
+                mouse_moved = True
+                # Wheel events carry no position
+                self.mouse_pos = getattr(event, "pos", self.mouse_pos)
+            mouse_pos = self.mouse_pos
+
             if event.type == pygame.QUIT:
                 self.quit_game()
 
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.full_redraw = True
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.toggle_overlay()
+                continue
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                path = self.profiler.toggle_recording()
+                print(f"{'Recording' if self.profiler.csv_writer else 'Saved'} frame timings: {path}")
+                continue
+            elif event.type == ASSET_LOADED:
+                pass  # Only wakes up event.wait; update() takes the images over
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                self.window_focused = False
+            elif event.type == pygame.WINDOWFOCUSGAINED:
+                self.window_focused = True
+            elif event.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+                self.window_visible = False
+            elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN):
+                self.window_visible = True
+                self.full_redraw = True
+
             if self.state == "PRESCREEN":
                 if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
                     self.sound_mgr.play("start")
@@ -144,27 +339,29 @@ class Game:
 
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
+                    button = self.get_button_at(event.pos)
+                    action = button.click(self.sound_mgr) if button else None
                     if self.state == "MENU":
-                        for btn in self.menu_buttons:
-                            action = btn.handle_click(self.sound_mgr)
-                            if action == "new_game":
-                                self.start_game(new=True)
-                            elif action == "load_game":
-                                self.start_game(new=False)
-                            elif action == "settings":
-                                self.prev_state = "MENU"
-                                self.state = "SETTINGS"
-                            elif action == "exit":
-                                self.quit_game()
+                        if action == "new_game":
+                            self.start_game(new=True)
+                        elif action == "load_game":
+                            self.start_game(new=False)
+                        elif action == "settings":
+                            self.prev_state = "MENU"
+                            self.state = "SETTINGS"
+                        elif action == "exit":
+                            self.quit_game()
 
                     elif self.state == "SETTINGS":
-                        action = self.settings_back_btn.handle_click(self.sound_mgr)
                         if action == "back":
                             self.settings_mgr.save()
                             self.state = self.prev_state
 
                     elif self.state == "GAME":
-                        if self.shop.is_open:
+                        if self.welcome_back:
+                            self.sound_mgr.play("select")
+                            self.welcome_back = None
+                        elif self.shop.is_open:
                             track_rect, thumb_rect, max_scroll = self.shop.get_scrollbar_info(WIDTH, HEIGHT,
                                                                                               self.shop_scroll)
                             if thumb_rect and thumb_rect.collidepoint(mouse_pos):
@@ -178,32 +375,18 @@ class Game:
                                 proportion = (new_thumb_top - track_rect.top) / track_space if track_space > 0 else 0
                                 self.shop_scroll = proportion * max_scroll
                             else:
-                                result = self.shop.handle_click(mouse_pos, self.game_mgr.leafs, self.sound_mgr)
-                                self.game_mgr.leafs, bought_plant, rate_boost, item_id, mult_value = result
-
-                                if mult_value > 1.0:
-                                    self.game_mgr.production_multiplier *= mult_value
-
-                                if item_id and rate_boost >= 0 and bought_plant:
-                                    self.game_mgr.plant_grid.insert(0, item_id)
-                                    self.game_mgr.upgrade_rate_bonus += rate_boost
-                                elif item_id and rate_boost > 0 and not bought_plant:
-                                    self.game_mgr.plant_grid.insert(0, item_id)
-                                    self.game_mgr.upgrade_rate_bonus += rate_boost
-
-                        else:
-                            for btn in self.game_buttons:
-                                action = btn.handle_click(self.sound_mgr)
-                                if action == "game_menu":
-                                    self.save_mgr.save_game(self.game_mgr.get_save_data(self.shop))
-                                    self.state = "MENU"
-                                    self.music_mgr.play_music("menu_music.mp3")
-                                elif action == "game_shop":
-                                    self.shop.toggle(is_upgrades=False)
-                                    self.shop_scroll = 0
-                                elif action == "game_upgrades":
-                                    self.shop.toggle(is_upgrades=True)
-                                    self.shop_scroll = 0
+                                self.shop.handle_click(event.pos, self.sound_mgr, self.shop_scroll)
+
+                        elif action == "game_menu":
+                            self.autosaver.submit(self.game_mgr.get_save_data(self.shop))
+                            self.state = "MENU"
+                            self.music_mgr.play_music("menu_music.mp3")
+                        elif action == "game_shop":
+                            self.shop.toggle(is_upgrades=False)
+                            self.shop_scroll = 0
+                        elif action == "game_upgrades":
+                            self.shop.toggle(is_upgrades=True)
+                            self.shop_scroll = 0
 
             if event.type == pygame.MOUSEMOTION:
                 if getattr(self, 'shop_scroll_dragging', False) and self.shop and self.shop.is_open:
@@ -228,6 +411,9 @@ class Game:
                     max_scroll = self.shop.get_max_scroll(WIDTH, HEIGHT)
                     if self.shop_scroll < 0: self.shop_scroll = 0
                     if self.shop_scroll > max_scroll: self.shop_scroll = max_scroll
+                elif self.state == "GAME" and not self.welcome_back and self.plant_field_rect.collidepoint(mouse_pos):
+                    # Wheel down zooms the plant field out towards density tiles
+                    self.plant_field.zoom(-event.y)
 
         if self.state == "SETTINGS":
             for e in events:
@@ -236,22 +422,41 @@ class Game:
                     self.music_mgr.update_volume()
                 if self.sfx_slider.handle_event(e):
                     self.settings_mgr.sfx_vol = self.sfx_slider.value
+                    self.sound_mgr.update_volume()
 
-    def update(self):
-        dt = self.clock.tick(FPS) / 1000.0
-        mouse_pos = pygame.mouse.get_pos()
-
-        if self.state == "MENU":
-            for btn in self.menu_buttons: btn.update(mouse_pos, self.sound_mgr)
-        elif self.state == "SETTINGS":
-            self.settings_back_btn.update(mouse_pos, self.sound_mgr)
-        elif self.state == "GAME":
-            if self.shop.is_open:
-                self.shop.check_hover(mouse_pos, self.sound_mgr)
-            else:
-                for btn in self.game_buttons: btn.update(mouse_pos, self.sound_mgr)
+        hover_key = self.get_hover_key()
+        if mouse_moved or hover_key != self.hover_key:
+            self.hover_key = hover_key
+            self.update_hover(self.mouse_pos)
 
+    def update(self):
+        fps = FPS if self.window_focused and self.window_visible else BACKGROUND_FPS
+        if self.player:
+            dt = self.player.dt  # No frame cap
+        else:
+            with self.profiler.phase("wait"):
+                ms = self.clock.tick(fps)
+            dt = ms / 1000.0
+            if self.recorder:
+                self.recorder.end_frame(ms)
+        if self.assets.update():
+            # Anything drawn with a placeholder is drawn again with the real image
+            if self.state == "GAME":
+                self.prepare_season_composites()
+            self.full_redraw = True
+        self.music_mgr.update()
+
+        if self.state == "GAME":
             self.game_mgr.update(dt)
+            self.prefetch_season()
+
+            # Hand over only; serialization and disk I/O happen on the autosave thread
+            self.autosaver.record(self.game_mgr.economy.take_journal())
+            if self.autosaver.is_due():
+                if self.autosaver.needs_compaction():
+                    self.autosaver.submit(self.game_mgr.get_save_data(self.shop))
+                else:
+                    self.autosaver.submit_records()
 
             # Check for season change to trigger music/BG fade
             if self.game_mgr.just_changed_season:
@@ -270,6 +475,26 @@ class Game:
             self.flash_timer += dt * 1000
 
     def draw(self):
+        if not self.window_visible:
+            return  # Nothing to see; WINDOWRESTORED forces a full redraw
+
+        if not self.dirty_rendering:
+            self.draw_scene()
+            with self.profiler.phase("flip"):
+                pygame.display.flip()
+            return
+
+        dirty = self.get_dirty_rects()
+        if not dirty:
+            return
+        for rect in dirty:
+            self.screen.set_clip(rect)
+            self.draw_scene()
+        self.screen.set_clip(None)
+        with self.profiler.phase("flip"):
+            pygame.display.update(dirty)
+
+    def draw_scene(self):
         self.screen.fill(BG_COLOR)
 
         if self.state == "PRESCREEN":
@@ -281,15 +506,53 @@ class Game:
         elif self.state == "GAME":
             self.draw_game()
 
-        pygame.display.flip()
+        self.profiler.draw_overlay(self.screen)
+
+    def get_frame_regions(self):
+        """(rect, key) for each screen region; the key changes whenever the region's content does.
+
+        The first entry is the whole screen, for things that repaint everything
+        (state changes, background fades, the shop and welcome back modals).
+        """
+        if self.state == "PRESCREEN":
+            return [(self.screen_rect, ("PRESCREEN", (self.flash_timer // 500) % 2))]
+        if self.state == "MENU":
+            return [(self.screen_rect, ("MENU", tuple(b.hovered for b in self.menu_buttons)))]
+        if self.state == "SETTINGS":
+            return [(self.screen_rect, ("SETTINGS", self.music_slider.value, self.sfx_slider.value,
+                                        self.settings_back_btn.hovered))]
+
+        stats = self.game_mgr.get_stats()
+        shop_key = self.shop.get_view_key(self.game_mgr.leafs, self.shop_scroll) if self.shop.is_open else None
+        fade_key = int(self.bg_fade_alpha) if self.next_bg else None
+        screen_key = ("GAME", self.current_bg, fade_key, shop_key, self.welcome_back is not None)
+
+        return [
+            (self.screen_rect, screen_key),
+            (self.top_bar_rect, tuple(b.hovered for b in self.game_buttons)),
+            (self.plant_field_rect, self.plant_field.get_key()),
+            (self.stat_bar_rect, (stats["season"], format_short(stats["rate"], 1),
+                                   format_short(stats["leafs"]))),
+            (self.season_overlay_rect, (stats["season_visual_alpha"], stats["season"]))
+        ]
+
+    def get_dirty_rects(self):
+        regions = self.get_frame_regions() + [(self.profiler.overlay_rect, self.profiler.get_overlay_key())]
+        prev, self.prev_regions = self.prev_regions, regions
+
+        if self.full_redraw or prev is None or len(prev) != len(regions) or prev[0][1] != regions[0][1]:
+            self.full_redraw = False
+            return [self.screen_rect]
+        return [rect for (rect, key), (_, prev_key) in zip(regions, prev) if key != prev_key]
 
     def _draw_common_menu_elements(self, title_y_offset):
-        if self.menu_bg:
-            self.screen.blit(self.menu_bg, (0, 0))
+        menu_bg = self.get_menu_bg()
+        if menu_bg:
+            self.screen.blit(menu_bg, (0, 0))
         else:
             self.screen.fill(BG_COLOR)
-        title = self.large_font.render("LEAFY LOOT", True, TEXT_COLOR)
-        shadow = self.large_font.render("LEAFY LOOT", True, (0, 0, 0))
+        title = render_text(self.large_font, "LEAFY LOOT", TEXT_COLOR)
+        shadow = render_text(self.large_font, "LEAFY LOOT", (0, 0, 0))
         self.screen.blit(shadow, (WIDTH // 2 - title.get_width() // 2 + 3, title_y_offset + 3))
         self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, title_y_offset))
 
@@ -301,56 +564,40 @@ class Game:
     def draw_prescreen(self):
         self._draw_common_menu_elements(title_y_offset=HEIGHT // 2 - 50)
         if (self.flash_timer // 500) % 2 == 0:
-            msg = self.font.render("Press any key to start", True, (200, 200, 200))
+            msg = render_text(self.font, "Press any key to start", (200, 200, 200))
             self.screen.blit(msg, (WIDTH // 2 - msg.get_width() // 2, HEIGHT // 2 + 50))
 
     def draw_settings(self):
-        if self.menu_bg:
-            self.screen.blit(self.menu_bg, (0, 0))
+        menu_bg = self.get_menu_bg()
+        if menu_bg:
+            self.screen.blit(menu_bg, (0, 0))
         else:
             self.screen.fill(BG_COLOR)
-        title = self.large_font.render("SETTINGS", True, TEXT_COLOR)
+        title = render_text(self.large_font, "SETTINGS", TEXT_COLOR)
         self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 100))
-        lbl = self.font.render(f"Music Volume: {int(self.music_slider.value * 100)}%", True, TEXT_COLOR)
+        lbl = render_text(self.font, f"Music Volume: {int(self.music_slider.value * 100)}%", TEXT_COLOR)
         self.screen.blit(lbl, (WIDTH // 2 - 100, 270))
         self.music_slider.draw(self.screen)
-        lbl2 = self.font.render(f"SFX Volume: {int(self.sfx_slider.value * 100)}%", True, TEXT_COLOR)
+        lbl2 = render_text(self.font, f"SFX Volume: {int(self.sfx_slider.value * 100)}%", TEXT_COLOR)
         self.screen.blit(lbl2, (WIDTH // 2 - 100, 370))
         self.sfx_slider.draw(self.screen)
         self.settings_back_btn.draw(self.screen)
 
     def draw_game(self):
-        # 1. Background (with Fade Support)
-        if self.current_bg:
+        # 1-3. Background, Top Bar and Planting Area (one pre-baked composite per season, with Fade Support)
+        with self.profiler.phase("background"):
             self.screen.blit(self.current_bg, (0, 0))
-        else:
-            self.screen.fill(BG_COLOR)  # Fallback
-
-        if self.next_bg:
-            # We must blit next_bg with alpha
-            # Pygame surfaces don't support per-pixel alpha easily without blitting to a temp surface
-            # but for a full screen fade, set_alpha on the surface works.
-            self.next_bg.set_alpha(int(self.bg_fade_alpha))
-            self.screen.blit(self.next_bg, (0, 0))
-            # Reset alpha for next frame use or when it becomes main bg
-            self.next_bg.set_alpha(255)
-
-            # 2. Top Bar
-        pygame.draw.rect(self.screen, GAME_UI_BG, (0, 0, WIDTH, 60))
-        pygame.draw.line(self.screen, TEXT_COLOR, (0, 60), (WIDTH, 60), 2)
-
-        # 3. Planting Area (Transparent)
-        # Create a surface with per-pixel alpha capability
-        plant_area_surf = pygame.Surface((WIDTH - 100, HEIGHT - 180), pygame.SRCALPHA)
-        # Fill with color + alpha (R, G, B, Alpha) - 180 is transparency level
-        r, g, b = PLANTING_AREA_COLOR
-        plant_area_surf.fill((r, g, b, 180))
-        self.screen.blit(plant_area_surf, (50, 80))
-        # Draw border
-        pygame.draw.rect(self.screen, (80, 100, 80), (50, 80, WIDTH - 100, HEIGHT - 180), 2, border_radius=10)
+
+            if self.next_bg:
+                # For a full screen fade, set_alpha on the opaque composite works.
+                self.next_bg.set_alpha(int(self.bg_fade_alpha))
+                self.screen.blit(self.next_bg, (0, 0))
+                # Reset alpha for next frame use or when it becomes main bg
+                self.next_bg.set_alpha(255)
 
         # 4. Draw Grid/Plants
-        self.draw_plants()
+        with self.profiler.phase("plants"):
+            self.draw_plants()
 
         # 5. Info Bar (Season | Rate | Leafs) with Icons
         stats = self.game_mgr.get_stats()
@@ -363,8 +610,8 @@ class Game:
         def draw_stat(idx, icon_key, text):
             center_x = (section_width * idx) + (section_width // 2)
 
-            icon = self.icons.get(icon_key)
-            txt_surf = self.font.render(text, True, TEXT_COLOR)
+            icon = self.assets.get(self.ICONS[icon_key], (32, 32))
+            txt_surf = render_text(self.font, text, TEXT_COLOR)
 
             total_w = txt_surf.get_width()
             if icon: total_w += icon.get_width() + 10
@@ -378,76 +625,138 @@ class Game:
                 self.screen.blit(txt_surf, (start_x, start_y))
 
         # Draw Stats: Season -> Rate -> Leafs
-        draw_stat(0, "season", f"{stats['season']}")
-        draw_stat(1, "rate", f"{stats['rate']:.1f}/s")
-        draw_stat(2, "leaf", f"{stats['leafs']}")
+        with self.profiler.phase("stat_bar"):
+            draw_stat(0, "season", f"{stats['season']}")
+            draw_stat(1, "rate", f"{format_short(stats['rate'], 1)}/s")
+            draw_stat(2, "leaf", format_short(stats["leafs"]))
 
         # 6. Buttons
         for btn in self.game_buttons: btn.draw(self.screen)
 
         # 7. Season Visual Overlay Text
         if stats.get('season_visual_alpha', 0) > 0:
-            alpha = stats['season_visual_alpha']
-            season_name = stats['season'].upper()
-            s_surf = pygame.Surface((WIDTH, 100), pygame.SRCALPHA)
-            s_surf.fill((0, 0, 0, min(150, alpha)))
-            s_font = pygame.font.Font(None, 80)
-            txt_s = s_font.render(f"{season_name} IS HERE", True, (255, 255, 255))
-            txt_s.set_alpha(alpha)
-            rect = txt_s.get_rect(center=(WIDTH // 2, 50))
-            s_surf.blit(txt_s, rect)
-            self.screen.blit(s_surf, (0, HEIGHT // 2 - 50))
+            with self.profiler.phase("season_overlay"):
+                alpha = stats['season_visual_alpha']
+                season_name = stats['season'].upper()
+                s_surf = pygame.Surface((WIDTH, 100), pygame.SRCALPHA)
+                s_surf.fill((0, 0, 0, min(150, alpha)))
+                s_font = get_font(80)
+                txt_s = render_text(s_font, f"{season_name} IS HERE", (255, 255, 255))
+                txt_s.set_alpha(alpha)  # Cached surface: alpha is re-set every frame before the blit
+                rect = txt_s.get_rect(center=(WIDTH // 2, 50))
+                s_surf.blit(txt_s, rect)
+                self.screen.blit(s_surf, (0, HEIGHT // 2 - 50))
 
         # 8. Shop Overlay
-        self.shop.draw(self.screen, WIDTH, HEIGHT, self.game_mgr.leafs, self.shop_scroll)
+        with self.profiler.phase("shop"):
+            self.shop.draw(self.screen, WIDTH, HEIGHT, self.game_mgr.leafs, self.shop_scroll)
+
+        # 9. Welcome Back Overlay
+        if self.welcome_back:
+            self.draw_welcome_back()
+
+    def draw_welcome_back(self):
+        title_text, lines = self.welcome_back
+        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        self.screen.blit(overlay, (0, 0))
+
+        rect = pygame.Rect(0, 0, 500, 260)
+        rect.center = (WIDTH // 2, HEIGHT // 2)
+        pygame.draw.rect(self.screen, (40, 40, 50), rect, border_radius=15)
+        pygame.draw.rect(self.screen, (144, 238, 144), rect, 4, border_radius=15)
+
+        title = render_text(self.large_font, title_text, TEXT_COLOR)
+        self.screen.blit(title, title.get_rect(center=(rect.centerx, rect.top + 50)))
+
+        for i, line in enumerate(lines):
+            txt = render_text(self.font, line, (200, 200, 200))
+            self.screen.blit(txt, txt.get_rect(center=(rect.centerx, rect.top + 110 + i * 35)))
+
+        hint = render_text(self.font, "Click to continue", (144, 238, 144))
+        self.screen.blit(hint, hint.get_rect(center=(rect.centerx, rect.bottom - 25)))
+
+    @staticmethod
+    def format_duration(seconds):
+        seconds = int(seconds)
+        days, seconds = divmod(seconds, 86400)
+        hours, seconds = divmod(seconds, 3600)
+        minutes, seconds = divmod(seconds, 60)
+        if days: return f"{days}d {hours}h"
+        if hours: return f"{hours}h {minutes}m"
+        if minutes: return f"{minutes}m {seconds}s"
+        return f"{seconds}s"
 
     def draw_plants(self):
-        # We iterate plant grid
-        for i, item_id in enumerate(self.game_mgr.plant_grid[:100]):
-            x, y = self.game_mgr.get_plant_screen_pos(i)
-            # Use universal loaded image or missing fallback
-            img = self.game_mgr.plant_images.get(item_id)
-
-            # Should not happen due to universal load, but safety check
-            if img:
-                self.screen.blit(img, (x, y))
-            else:
-                # Ultimate failsafe magenta circle
-                pygame.draw.circle(self.screen, (255, 0, 255), (x + 20, y + 20), 15)
+        self.plant_field.draw(self.screen)
 
     def start_game(self, new=False):
         if new:
             data = self.save_mgr.new_game()
         else:
+            # Let the last session's writes land before reading the files back
+            self.autosaver.flush()
             data = self.save_mgr.load_game()
 
-        self.game_mgr = GameManager(data)
-        self.shop = Shop()
-
-        if "shop_state" in data:
-            self.shop.load_state(data["shop_state"])
+        self.game_mgr = GameManager(data, self.assets, self.player.offline() if self.player else None)
+        if self.recorder:
+            self.recorder.offline(self.game_mgr.offline_elapsed)
+        self.shop = Shop(self.game_mgr.economy)
+        self.plant_field = PlantField(self.game_mgr, self.plant_field_rect)
+        summary = self.game_mgr.offline_summary
+        warning = None if new else self.save_mgr.load_warning
+        if warning:
+            self.welcome_back = ("SAVE DAMAGED", warning)
+        elif summary:
+            self.welcome_back = ("WELCOME BACK", [
+                f"You were away for {self.format_duration(summary['elapsed'])}",
+                f"Your garden grew {format_short(summary['leafs_earned'])} Leafs",
+                f"Seasons passed: {summary['seasons_passed']} (now {summary['end_season']})",
+            ])
         else:
-            self.shop.recalculate_cost(self.game_mgr.plants)
+            self.welcome_back = None
+
+        # Fresh snapshot so this session's journal starts from the state on screen
+        self.autosaver.submit(self.game_mgr.get_save_data(self.shop))
 
         # Initialize Background and Music for current season
-        self.current_bg = self.backgrounds.get(self.game_mgr.season)
+        self.prepare_season_composites()
+        self.current_bg = self.get_season_composite(self.game_mgr.season)
+        self.next_bg = None
         self.update_music(self.game_mgr.season)
 
         self.state = "GAME"
 
     def quit_game(self):
         if self.game_mgr:
-            self.save_mgr.save_game(self.game_mgr.get_save_data(self.shop))
+            self.autosaver.flush(self.game_mgr.get_save_data(self.shop))
         self.settings_mgr.save()
+        self.profiler.close()
+        if self.recorder:
+            self.recorder.close(self.game_mgr.economy.get_save_data() if self.game_mgr else None)
         pygame.quit()
         sys.exit()
 
-    def run(self):
-        while True:
+    def step(self):
+        """One frame: input, update, draw."""
+        with self.profiler.phase("input"):
             self.handle_input()
+        with self.profiler.phase("update"):
             self.update()
+        with self.profiler.phase("draw"):
             self.draw()
+        self.profiler.end_frame()
+
+    def run(self):
+        while True:
+            self.step()
 
 
 if __name__ == "__main__":
-    Game().run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Leafy Loot")
+    parser.add_argument("--record", metavar="LOG", help="log input and frame times for replay.py")
+    args = parser.parse_args()
+    game = Game()
+    if args.record:
+        game.start_recording(args.record)
+    game.run()
\ No newline at end of file
@@ -3,7 +3,18 @@ import os
 import json
 import time
 import random
-from settings import ASSETS_DIR, SETTINGS_FILE, SAVE_FILE
+import threading
+from collections import OrderedDict
+from settings import (ASSETS_DIR, SETTINGS_FILE, SAVE_FILE, LEGACY_SAVE_FILE, JOURNAL_FILE, AUTOSAVE_INTERVAL,
+                      AUTOSAVE_DEBOUNCE, JOURNAL_COMPACT_EVERY, ASSET_MEMORY_BUDGET, ASSET_CACHE_FILE, MUSIC_CHANNELS,
+                      SFX_VOICES, SFX_COOLDOWNS, ASSET_CACHE_SAVE_DELAY)
+from savefile import read_save, write_save, read_journal, append_journal, reset_journal
+from assetcache import AssetCache
+
+
+# Posted by the asset and music workers when something they loaded is ready,
+# so loops blocked in event.wait pick it up
+ASSET_LOADED = pygame.event.custom_type()
 
 
 class SettingsManager:
@@ -28,12 +39,67 @@ class SettingsManager:
             json.dump(data, f, indent=2)
 
 
+_reserved_channels = 0
+
+
+def reserve_channels(count):
+    """Keeps the first `count` mixer channels for explicit use; Sound.play() never picks them."""
+    global _reserved_channels
+    if count > _reserved_channels:
+        if pygame.mixer.get_num_channels() < count:
+            pygame.mixer.set_num_channels(count)
+        _reserved_channels = pygame.mixer.set_reserved(count)
+
+
+class VoicePool:
+    """Fixed mixer channels for one category of sound effects.
+
+    A sound asked for again within `cooldown` seconds is dropped. When every
+    channel is busy, the one that started longest ago is stolen.
+    """
+
+    def __init__(self, channels, cooldown):
+        self.channels = channels
+        self.cooldown = cooldown
+        self.started = [0.0] * len(channels)
+        self.last_played = {}  # sound name -> time it last played
+
+    def play(self, name, sound):
+        now = time.monotonic()
+        if now - self.last_played.get(name, -self.cooldown) < self.cooldown:
+            return False
+        self.last_played[name] = now
+
+        idle = [i for i, channel in enumerate(self.channels) if not channel.get_busy()]
+        i = idle[0] if idle else min(range(len(self.channels)), key=self.started.__getitem__)
+        self.channels[i].play(sound)
+        self.started[i] = now
+        return True
+
+    def set_volume(self, volume):
+        for channel in self.channels:
+            channel.set_volume(volume)
+
+
 class SoundManager:
+    # Sounds by voice pool; anything not listed plays in "ui"
+    CATEGORIES = {"hover": "hover"}
+
     def __init__(self, settings_mgr):
         self.sounds = {}
         self.settings = settings_mgr
         self.sounds["default"] = pygame.mixer.Sound(buffer=bytes([0] * 1000))
 
+        # Channels after the music ones, SFX_VOICES per category
+        self.pools = {}
+        first = MUSIC_CHANNELS
+        for category, voices in SFX_VOICES.items():
+            channels = [pygame.mixer.Channel(i) for i in range(first, first + voices)]
+            self.pools[category] = VoicePool(channels, SFX_COOLDOWNS[category])
+            first += voices
+        reserve_channels(first)
+        self.update_volume()
+
     def load_sound(self, name, filename):
         path = os.path.join(ASSETS_DIR, filename)
         if os.path.exists(path):
@@ -42,8 +108,13 @@ class SoundManager:
             except Exception:
                 print(f"Error loading {filename}")
 
+    def update_volume(self):
+        """Applies SettingsManager.sfx_vol to the voice channels; call after it changes."""
+        for pool in self.pools.values():
+            pool.set_volume(self.settings.sfx_vol)
+
     def play(self, name):
-        vol = self.settings.sfx_vol
+        pool = self.pools[self.CATEGORIES.get(name, "ui")]
 
         # Randomize Hover Logic
         if name == "hover":
@@ -53,46 +124,276 @@ class SoundManager:
             if "hover2" in self.sounds: options.append("hover2")
 
             if options:
-                choice = random.choice(options)
-                self.sounds[choice].set_volume(vol)
-                self.sounds[choice].play()
+                pool.play(name, self.sounds[random.choice(options)])
             return
 
         if name in self.sounds:
-            self.sounds[name].set_volume(vol)
-            self.sounds[name].play()
+            pool.play(name, self.sounds[name])
 
 
 class MusicManager:
+    """Looping music on two reserved mixer channels, so a change of track is a true crossfade.
+
+    Tracks are decoded into Sounds on a worker thread. play_music() on a track
+    that is not decoded yet keeps the current one playing and switches once it
+    is ready; prefetch() lets callers decode a track before they need it, so
+    the switch itself costs the frame nothing. Only the playing, requested and
+    prefetched tracks stay decoded.
+    """
+
     def __init__(self, settings_mgr):
         self.current_music = None
         self.settings = settings_mgr
-        self.fading = False
+        self.wanted = None  # (filename, fade_ms) waiting for its decode
+        self.prefetched = None
+        self.tracks = {}  # filename -> decoded Sound
 
-    def play_music(self, filename, fade_ms=1000):
-        # Construct path based on season filename rules
-        path = os.path.join(ASSETS_DIR, filename)
+        reserve_channels(MUSIC_CHANNELS)  # Sound effects never take the music channels
+        self.channels = [pygame.mixer.Channel(i) for i in range(MUSIC_CHANNELS)]
+        self.active = 0
+        self.update_volume()
+
+        # Shared with the worker, guarded by cond
+        self.queue = []
+        self.decoded = {}
+        self.cond = threading.Condition()
+        self.worker = threading.Thread(target=self._run, name="music", daemon=True)
+        self.worker.start()
 
+    def prefetch(self, filename):
+        """Starts decoding `filename` in the background. Cheap to call every frame."""
+        if filename == self.prefetched or filename in self.tracks:
+            return
+        self.prefetched = filename
+        self.request(filename)
+
+    def request(self, filename):
+        if filename in self.tracks:
+            return
+        path = os.path.join(ASSETS_DIR, filename)
         if not os.path.exists(path):
             print(f"Music file not found: {filename}")
             return
+        with self.cond:
+            if filename not in self.queue and filename not in self.decoded:
+                self.queue.append(filename)
+                self.cond.notify()
+
+    def play_music(self, filename, fade_ms=1000):
+        if filename == self.current_music:
+            self.wanted = None
+            return
+        self.wanted = (filename, fade_ms)
+        self.request(filename)
+        self.update()
+
+    def update(self):
+        """Takes over decoded tracks and starts a requested one once it is ready (main thread)."""
+        with self.cond:
+            decoded, self.decoded = self.decoded, {}
+        self.tracks.update((name, sound) for name, sound in decoded.items() if sound is not None)
+
+        if self.wanted and self.wanted[0] in self.tracks:
+            filename, fade_ms = self.wanted
+            self.wanted = None
+            self.crossfade(filename, fade_ms)
+        elif self.wanted and self.wanted[0] in decoded:
+            self.wanted = None  # Could not be decoded; keep what is playing
+
+    def crossfade(self, filename, fade_ms):
+        old = self.channels[self.active]
+        self.active = 1 - self.active
+        new = self.channels[self.active]
+        if fade_ms:
+            old.fadeout(fade_ms)
+        else:
+            old.stop()
+        new.play(self.tracks[filename], loops=-1, fade_ms=fade_ms)
+        self.current_music = filename
+
+        # The fading track stays alive on its channel; drop everything not needed next
+        keep = (filename, self.prefetched)
+        self.tracks = {name: sound for name, sound in self.tracks.items() if name in keep}
 
-        if self.current_music != filename:
+    def update_volume(self):
+        for channel in self.channels:
+            channel.set_volume(self.settings.music_vol)
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.queue:
+                    self.cond.wait()
+                filename = self.queue[0]
             try:
-                pygame.mixer.music.load(path)
-                pygame.mixer.music.set_volume(self.settings.music_vol)
-                pygame.mixer.music.play(-1, fade_ms=fade_ms)
-                self.current_music = filename
-            except Exception as e:
+                sound = pygame.mixer.Sound(os.path.join(ASSETS_DIR, filename))
+            except (pygame.error, OSError) as e:
                 print(f"Music Error: {e}")
+                sound = None
+            with self.cond:
+                self.queue.pop(0)
+                self.decoded[filename] = sound
+            try:
+                pygame.event.post(pygame.event.Event(ASSET_LOADED))
+            except pygame.error:
+                pass  # Display already shut down
 
-    def update_volume(self):
-        pygame.mixer.music.set_volume(self.settings.music_vol)
+
+class AssetManager:
+    """Images from ASSETS_DIR, decoded and scaled on a worker thread.
+
+    get() never blocks: it queues the load and returns None until the image is
+    ready. The worker reads pre-scaled pixels from the asset cache file and
+    only decodes images that are not in it yet, writing them to the file once
+    it has sat idle for ASSET_CACHE_SAVE_DELAY seconds. Finished loads are converted on the main thread by update(), which
+    bumps `generation` so cached layers built without them know to re-render.
+    Decoded images live in an LRU that is trimmed to `budget` bytes. Files that
+    fail to load share one fallback surface per size.
+    """
+
+    def __init__(self, budget=ASSET_MEMORY_BUDGET, cache_file=ASSET_CACHE_FILE):
+        self.budget = budget
+        self.cache_file = cache_file
+        self.resident = OrderedDict()  # (file_name, size, alpha) -> Surface, least recently used first
+        self.used = 0
+        self.missing = set()
+        self.fallbacks = {}  # Size -> shared fallback surface
+        self.generation = 0
+
+        # Decoded once, here on the main thread where it can be converted like every other image
+        missing_img = self.load_image("missing.png", None, True)
+        self.missing_img = missing_img.convert_alpha() if missing_img else None
+
+        # Shared with the worker, guarded by cond
+        self.queue = []
+        self.done = []
+        self.pending = set()
+        self.cond = threading.Condition()
+        self.worker = threading.Thread(target=self._run, name="assets", daemon=True)
+        self.worker.start()
+
+    def request(self, file_name, size=None, alpha=True):
+        """Starts loading an image ahead of the first get()."""
+        key = (file_name, size, alpha)
+        if key in self.resident or key in self.missing:
+            return
+        with self.cond:
+            if key not in self.pending:
+                self.pending.add(key)
+                self.queue.append(key)
+                self.cond.notify()
+
+    def get(self, file_name, size=None, alpha=True, fallback=False):
+        """The image scaled to `size`, or None while it loads.
+
+        A file that cannot be loaded gives None, or the shared fallback
+        (missing.png, else a magenta square) when `fallback` is set.
+        """
+        key = (file_name, size, alpha)
+        surf = self.resident.get(key)
+        if surf is not None:
+            self.resident.move_to_end(key)
+            return surf
+        if key in self.missing:
+            return self.get_fallback(size) if fallback else None
+        self.request(file_name, size, alpha)
+        return None
+
+    def get_fallback(self, size):
+        surf = self.fallbacks.get(size)
+        if surf is None:
+            if self.missing_img is None:
+                surf = pygame.Surface(size or (40, 40)).convert()
+                surf.fill((255, 0, 255))
+            elif size:
+                surf = pygame.transform.scale(self.missing_img, size)
+            else:
+                surf = self.missing_img
+            self.fallbacks[size] = surf
+        return surf
+
+    def update(self):
+        """Takes over finished loads (main thread). Returns True if any arrived."""
+        with self.cond:
+            if not self.done:
+                return False
+            done, self.done = self.done, []
+            for key, _ in done:
+                self.pending.discard(key)
+
+        for key, img in done:
+            if img is None:
+                self.missing.add(key)
+                continue
+            surf = img.convert_alpha() if key[2] else img.convert()
+            self.resident[key] = surf
+            self.used += surf.get_pitch() * surf.get_height()
+
+        # Least recently used first; whatever just arrived is newest and kept
+        while self.used > self.budget and len(self.resident) > 1:
+            _, surf = self.resident.popitem(last=False)
+            self.used -= surf.get_pitch() * surf.get_height()
+
+        self.generation += 1
+        return True
+
+    @staticmethod
+    def load_image(file_name, size, alpha):
+        """Decodes and scales one image, bypassing the cache; None if it is missing or unreadable."""
+        path = os.path.join(ASSETS_DIR, file_name)
+        if not os.path.exists(path):
+            return None
+        try:
+            img = pygame.image.load(path)
+            if size:
+                img = pygame.transform.scale(img, size)
+            return img
+        except (pygame.error, OSError):
+            return None
+
+    def _run(self):
+        cache = AssetCache(self.cache_file, ASSETS_DIR)
+        retry_save = True  # Cleared by a failed save until something new is loaded
+        while True:
+            with self.cond:
+                # New images are written once no request has come in for ASSET_CACHE_SAVE_DELAY seconds,
+                # so a burst of loads costs one rewrite of the file instead of one per idle moment
+                while not self.queue:
+                    unsaved = cache.dirty and retry_save
+                    if not self.cond.wait(ASSET_CACHE_SAVE_DELAY if unsaved else None) and unsaved:
+                        break
+                key = self.queue.pop(0) if self.queue else None
+
+            if key is None:
+                try:
+                    cache.save()
+                except (OSError, pygame.error) as e:
+                    print(f"Could not write the asset cache: {e}")
+                    retry_save = False
+                continue
+
+            img = cache.get(*key)
+            if img is None:
+                img = cache.load(*key)
+                retry_save = True
+            with self.cond:
+                self.done.append((key, img))
+            try:
+                pygame.event.post(pygame.event.Event(ASSET_LOADED))
+            except pygame.error:
+                pass  # Display already shut down
 
 
 class SaveManager:
+    def __init__(self):
+        self.load_warning = None  # Lines telling the player why load_game started a new game, if it had to
+
+    def has_snapshot(self):
+        """True once savegame.dat has been written, even if it was later set aside as damaged."""
+        return os.path.exists(SAVE_FILE) or os.path.exists(SAVE_FILE + ".corrupt")
+
     def save_exists(self):
-        return os.path.exists(SAVE_FILE)
+        return os.path.exists(SAVE_FILE) or (not self.has_snapshot() and os.path.exists(LEGACY_SAVE_FILE))
 
     def new_game(self):
         return {
@@ -103,15 +404,150 @@ class SaveManager:
         }
 
     def load_game(self):
-        if os.path.exists(SAVE_FILE):
+        self.load_warning = None
+        # The old JSON save only counts until the first savegame.dat; after that it is older than any progress
+        path = SAVE_FILE if self.has_snapshot() else LEGACY_SAVE_FILE
+        if not os.path.exists(path):
+            return self.new_game()
+        name = os.path.basename(path)
+        try:
+            data = read_save(path)
+        except (OSError, ValueError) as e:
+            # Keep the damaged file aside instead of overwriting it on the next save
+            print(f"Could not load {name}: {e}")
+            self.load_warning = [f"{name} could not be read.", "A new garden was started."]
             try:
-                with open(SAVE_FILE, "r") as f:
-                    return json.load(f)
-            except:
+                os.replace(path, path + ".corrupt")
+                self.load_warning.insert(1, f"It was kept as {name}.corrupt.")
+            except OSError:
                 pass
-        return self.new_game()
+            return self.new_game()
+
+        # Economy replays these on top of the snapshot
+        try:
+            data["journal"] = read_journal(JOURNAL_FILE, data.get("journal_gen"))
+        except OSError as e:
+            print(f"Could not read the save journal: {e}")
+            data["journal"] = []
+        if data["journal"]:
+            data["last_updated"] = data["journal"][-1]["t"]
+        return data
 
     def save_game(self, data):
         data["last_updated"] = time.time()
-        with open(SAVE_FILE, "w") as f:
-            json.dump(data, f, indent=2)
\ No newline at end of file
+        self.write(data)
+
+    def write(self, data):
+        """Writes a full snapshot that already carries its last_updated stamp and starts a new journal."""
+        data["journal_gen"] = time.time_ns()
+        write_save(SAVE_FILE, data)
+        reset_journal(JOURNAL_FILE, data["journal_gen"])
+        if os.path.exists(LEGACY_SAVE_FILE):
+            # Migrated: set the old JSON save aside so it can never be loaded over newer progress
+            try:
+                os.replace(LEGACY_SAVE_FILE, LEGACY_SAVE_FILE + ".migrated")
+            except OSError as e:
+                print(f"Could not set the old save aside: {e}")
+
+    def append_journal(self, records):
+        """Appends economy events on top of the last snapshot written by this manager."""
+        append_journal(JOURNAL_FILE, records)
+
+
+class AutoSaver:
+    """Saves on a worker thread so the render thread only pays for handing data over.
+
+    Economy events are appended to the journal AUTOSAVE_DEBOUNCE seconds after
+    the last of a burst of purchases, and at least every AUTOSAVE_INTERVAL
+    seconds while events keep coming. Leafs between events follow from the
+    offline progress formula, so nothing is written while nothing happens.
+    Once the journal holds JOURNAL_COMPACT_EVERY records, the next save is a
+    full snapshot instead.
+    """
+
+    def __init__(self, save_mgr, interval=AUTOSAVE_INTERVAL, debounce=AUTOSAVE_DEBOUNCE):
+        self.save_mgr = save_mgr
+        self.interval = interval
+        self.debounce = debounce
+        self.next_due = 0
+        self.dirty_since = None
+
+        self.records = []  # Events not yet handed to the worker (main thread only)
+        self.journal_size = 0  # Events handed over since the last snapshot
+
+        # Shared with the worker, guarded by cond
+        self.pending = None
+        self.pending_records = []
+        self.busy = False
+        self.cond = threading.Condition()
+        self.worker = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self.worker.start()
+
+    def record(self, events):
+        """Queues economy events and pushes the next save to AUTOSAVE_DEBOUNCE seconds from now."""
+        if not events: return
+        self.records.extend(events)
+        now = time.monotonic()
+        if self.dirty_since is None:
+            self.dirty_since = now
+        self.next_due = min(now + self.debounce, self.dirty_since + self.interval)
+
+    def is_due(self):
+        return bool(self.records) and time.monotonic() >= self.next_due
+
+    def needs_compaction(self):
+        return self.journal_size + len(self.records) >= JOURNAL_COMPACT_EVERY
+
+    def submit(self, data):
+        """Hands a full snapshot from get_save_data to the worker. Supersedes any queued events."""
+        data["last_updated"] = time.time()
+        with self.cond:
+            self.pending = data
+            self.pending_records = []
+            self.cond.notify()
+        self.records = []
+        self.journal_size = 0
+        self.dirty_since = None
+
+    def submit_records(self):
+        """Hands the queued events to the worker to append to the journal."""
+        with self.cond:
+            self.pending_records.extend(self.records)
+            self.cond.notify()
+        self.journal_size += len(self.records)
+        self.records = []
+        self.dirty_since = None
+
+    def flush(self, data=None):
+        """Submits `data` if given, then blocks until everything handed over is on disk."""
+        if data is not None:
+            self.submit(data)
+        elif self.records:
+            self.submit_records()
+        with self.cond:
+            while self.pending is not None or self.pending_records or self.busy:
+                if not self.worker.is_alive():
+                    print("Autosave worker stopped; the last changes were not saved")
+                    return
+                self.cond.wait(0.5)  # Wakes up to notice a worker that died
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.pending is None and not self.pending_records:
+                    self.cond.wait()
+                data, self.pending = self.pending, None
+                records, self.pending_records = self.pending_records, []
+                self.busy = True
+            try:
+                if data is not None:
+                    self.save_mgr.write(data)
+                if records:
+                    self.save_mgr.append_journal(records)
+            except Exception as e:
+                # Anything, not only I/O: a dead worker would leave flush() waiting forever
+                print(f"Autosave failed: {e!r}")
+            finally:
+                with self.cond:
+                    self.busy = False
+                    self.cond.notify_all()
\ No newline at end of file
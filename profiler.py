@@ -0,0 +1,197 @@
+import csv
+import os
+import time
+from collections import deque
+import pygame
+from settings import PROFILER_HISTORY, PROFILER_BUCKETS_MS, SAVE_DIR, WIDTH
+from fonts import get_font, render_text
+
+# Timed phases, in overlay and CSV column order. Nested phases are exclusive:
+# time spent in "plants" is not also counted in the "draw" around it.
+PHASES = ["wait", "input", "update", "draw", "background", "plants", "stat_bar", "shop", "season_overlay", "flip"]
+
+OVERLAY_REFRESH = 0.25  # Seconds between overlay rebuilds
+LINE_H = 18
+HIST_H = 50
+
+
+class _NullPhase:
+    """What phase() hands out while profiling is off: entering and leaving it does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        now = time.perf_counter()
+        stack = self.profiler.stack
+        if stack:
+            # Pause the enclosing phase
+            parent = stack[-1]
+            self.profiler.times[parent.name] += now - parent.start
+        stack.append(self)
+        self.start = now
+        return self
+
+    def __exit__(self, *exc):
+        now = time.perf_counter()
+        stack = self.profiler.stack
+        self.profiler.times[self.name] += now - self.start
+        stack.pop()
+        if stack:
+            stack[-1].start = now
+        return False
+
+
+class FrameProfiler:
+    """Per-phase frame timings, with an overlay and CSV export.
+
+    Wrap work in `with profiler.phase(name):` and call end_frame() once per
+    frame. Nothing is timed unless the overlay is shown or a CSV is being
+    recorded; until then phase() returns a shared no-op.
+    """
+
+    def __init__(self, history=PROFILER_HISTORY):
+        self.show_overlay = False
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.stack = []
+        self.frames = deque(maxlen=history)  # (frame, *phase) seconds per frame
+        self.frame_start = None
+
+        self.csv_path = None
+        self.csv_file = None
+        self.csv_writer = None
+
+        self.overlay = None
+        self.overlay_key = None
+        height = 28 + LINE_H * (len(PHASES) + 2) + HIST_H + 24
+        self.overlay_rect = pygame.Rect(0, 0, 260, height)
+        self.overlay_rect.topright = (WIDTH - 10, 70)
+
+    @property
+    def enabled(self):
+        return self.show_overlay or self.csv_writer is not None
+
+    def phase(self, name):
+        return _Phase(self, name) if self.enabled else NULL_PHASE
+
+    def end_frame(self):
+        if not self.enabled:
+            self.frame_start = None
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            row = (now - self.frame_start, *(self.times[p] for p in PHASES))
+            self.frames.append(row)
+            if self.csv_writer:
+                self.csv_writer.writerow([f"{t * 1000:.3f}" for t in row])
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = now
+
+    # --- STATS ---
+    def get_percentiles(self, column, percentiles=(50, 95, 99)):
+        """Milliseconds at each percentile of the rolling window; column 0 is the whole frame."""
+        values = sorted(row[column] for row in self.frames)
+        if not values:
+            return [0.0] * len(percentiles)
+        last = len(values) - 1
+        return [values[min(last, round(p / 100 * last))] * 1000 for p in percentiles]
+
+    def get_histogram(self):
+        """Frame counts per PROFILER_BUCKETS_MS bucket, plus one for anything slower."""
+        counts = [0] * (len(PROFILER_BUCKETS_MS) + 1)
+        for row in self.frames:
+            ms = row[0] * 1000
+            i = 0
+            while i < len(PROFILER_BUCKETS_MS) and ms > PROFILER_BUCKETS_MS[i]:
+                i += 1
+            counts[i] += 1
+        return counts
+
+    # --- CONTROLS ---
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+
+    def toggle_recording(self, path=None):
+        """Starts or stops writing every frame's timings (ms) to a CSV, by default next to the save. Returns the path."""
+        if self.csv_file:
+            self.csv_file.close()
+            self.csv_file = self.csv_writer = None
+            return self.csv_path
+
+        self.csv_path = path or os.path.join(SAVE_DIR, time.strftime("frames_%Y%m%d_%H%M%S.csv"))
+        self.csv_file = open(self.csv_path, "w", newline="")
+        self.csv_writer = csv.writer(self.csv_file)
+        self.csv_writer.writerow(["frame"] + PHASES)
+        return self.csv_path
+
+    def close(self):
+        if self.csv_file:
+            self.toggle_recording()
+
+    # --- OVERLAY ---
+    def get_overlay_key(self):
+        """Changes whenever the overlay is due for a rebuild; None while it is hidden."""
+        return int(time.monotonic() / OVERLAY_REFRESH) if self.show_overlay else None
+
+    def draw_overlay(self, screen):
+        if not self.show_overlay:
+            return
+        key = self.get_overlay_key()
+        if key != self.overlay_key:
+            # Rebuilt a few times a second; every other frame it is a single blit
+            self.overlay_key = key
+            self.overlay = self.build_overlay()
+        screen.blit(self.overlay, self.overlay_rect)
+
+    def build_overlay(self):
+        font = get_font(18)
+        line_h = LINE_H
+        rows = [("frame", self.get_percentiles(0))]
+        rows += [(name, self.get_percentiles(i + 1)) for i, name in enumerate(PHASES)]
+        histogram = self.get_histogram()
+
+        width, hist_h = self.overlay_rect.width, HIST_H
+        surf = pygame.Surface(self.overlay_rect.size, pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 190))
+
+        color = (200, 230, 200)
+        title = f"{'REC ' if self.csv_writer else ''}{len(self.frames)} frames"
+        surf.blit(render_text(font, title, color), (8, 6))
+        for x, label in zip((150, 200, 250), ("p50", "p95", "p99")):
+            text = render_text(font, label, color)
+            surf.blit(text, text.get_rect(topright=(x, 6)))
+
+        for i, (name, values) in enumerate(rows):
+            y = 28 + i * line_h
+            surf.blit(render_text(font, name, color), (8, y))
+            for x, ms in zip((150, 200, 250), values):
+                # Straight font.render: these change every rebuild and would only churn the text cache
+                text = font.render(f"{ms:.1f}", True, color)
+                surf.blit(text, text.get_rect(topright=(x, y)))
+
+        # Frame time histogram, one bar per bucket
+        top = 28 + line_h * (len(rows) + 1)
+        bar_w = (width - 16) // len(histogram)
+        peak = max(histogram) or 1
+        for i, count in enumerate(histogram):
+            h = hist_h * count // peak
+            slow = i > 0 and PROFILER_BUCKETS_MS[i - 1] >= 1000 / 60
+            pygame.draw.rect(surf, (220, 120, 90) if slow else (120, 200, 120),
+                             (8 + i * bar_w, top + hist_h - h, bar_w - 2, h))
+        labels = f"<{PROFILER_BUCKETS_MS[0]}ms  ...  >{PROFILER_BUCKETS_MS[-1]}ms"
+        surf.blit(render_text(font, labels, color), (8, top + hist_h + 4))
+        return surf
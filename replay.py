@@ -0,0 +1,232 @@
+"""Input recording and headless replay: turns a reported stutter into a repeatable benchmark.
+
+    python main.py --record session.lfr          # play; the log is written when the game quits
+    python replay.py session.lfr                 # replays it headlessly and checks the final state
+    python replay.py session.lfr --csv frames.csv --dt 16
+
+A log is a gzip of JSON lines. The header holds the save, journal and
+settings files as they were when recording started, so the replay starts
+from the same game. Each following line is one frame: the dt in ms that
+clock.tick returned, the input events handle_input saw, and the offline
+time credited if a game was started that frame. The last line holds the
+economy state at quit.
+
+Replays run under SDL's dummy drivers in a temp save dir, with no frame
+cap: each frame's dt comes from the log instead of the clock, so the
+economy takes exactly the recorded steps and must end in the recorded
+state. --dt replaces every dt with one fixed step instead; the final
+state is then not expected to match. The frame profiler records every
+frame, and the slowest ones are listed by frame number.
+"""
+import argparse
+import base64
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+
+import pygame
+
+LOG_VERSION = 1
+SLOWEST_SHOWN = 5
+
+# Input that reaches game logic; window exposure and asset wake-ups are left to the replaying process
+RECORDED_EVENTS = {
+    pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT,
+    pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
+    pygame.WINDOWFOCUSGAINED, pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED, pygame.WINDOWRESTORED,
+    pygame.WINDOWSHOWN, pygame.WINDOWHIDDEN,
+}
+
+
+def encode_event(event):
+    """[type, attrs] with only the JSON-safe attributes; the window handle and touch ids are dropped."""
+    attrs = {}
+    for key, value in event.dict.items():
+        if isinstance(value, (bool, int, float, str)):
+            attrs[key] = value
+        elif isinstance(value, tuple):
+            attrs[key] = list(value)
+    return [event.type, attrs]
+
+
+def decode_event(data):
+    event_type, attrs = data
+    return pygame.event.Event(event_type, {k: tuple(v) if isinstance(v, list) else v for k, v in attrs.items()})
+
+
+class InputRecorder:
+    """Writes a log while Game runs. Game calls capture, offline and end_frame; quit_game calls close."""
+
+    def __init__(self, path, save_files, mouse_pos):
+        self.path = path
+        self.file = gzip.open(path, "wt", encoding="utf-8")
+        files = {}
+        for file_path in save_files:
+            if os.path.exists(file_path):
+                with open(file_path, "rb") as f:
+                    files[os.path.basename(file_path)] = base64.b64encode(f.read()).decode("ascii")
+        self.write({"version": LOG_VERSION, "pygame": pygame.version.ver, "created": time.time(),
+                    "mouse_pos": list(mouse_pos), "files": files})
+        self.events = []
+        self.offline_elapsed = None
+
+    def write(self, record):
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def capture(self, events):
+        self.events.extend(encode_event(e) for e in events if e.type in RECORDED_EVENTS)
+
+    def offline(self, elapsed):
+        self.offline_elapsed = elapsed
+
+    def end_frame(self, dt_ms):
+        frame = [dt_ms, self.events]
+        if self.offline_elapsed is not None:
+            frame.append(self.offline_elapsed)
+        self.write(frame)
+        self.events = []
+        self.offline_elapsed = None
+
+    def close(self, state):
+        """Ends the log with the final economy state (None outside a game)."""
+        if self.file is None:
+            return
+        if self.events:
+            self.end_frame(0)  # The quit frame never reached update()
+        self.write({"end": state})
+        self.file.close()
+        self.file = None
+
+
+class InputPlayer:
+    """Feeds a log back to Game: events from next_events, the frame's dt from dt, offline time from offline."""
+
+    def __init__(self, path, fixed_dt_ms=None):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        self.header = lines[0]
+        if self.header.get("version") != LOG_VERSION:
+            raise ValueError(f"{path}: unsupported log version {self.header.get('version')}")
+        self.end_state = None
+        self.frames = []
+        for line in lines[1:]:
+            if isinstance(line, dict):
+                self.end_state = line.get("end")
+            else:
+                self.frames.append(line)
+        self.fixed_dt_ms = fixed_dt_ms
+        self.index = -1
+
+    @property
+    def done(self):
+        return self.index + 1 >= len(self.frames)
+
+    def restore_files(self, save_dir):
+        """Writes the save files from the header into `save_dir`."""
+        for name, data in self.header["files"].items():
+            with open(os.path.join(save_dir, name), "wb") as f:
+                f.write(base64.b64decode(data))
+
+    def next_events(self):
+        """Moves to the next frame and returns its events."""
+        self.index += 1
+        return [decode_event(e) for e in self.frames[self.index][1]]
+
+    @property
+    def dt(self):
+        if self.fixed_dt_ms is not None:
+            return self.fixed_dt_ms / 1000.0
+        return self.frames[self.index][0] / 1000.0
+
+    def offline(self):
+        """Seconds of offline progress the recording credited this frame."""
+        frame = self.frames[self.index]
+        return frame[2] if len(frame) > 2 else 0.0
+
+
+def diff_states(expected, actual, prefix=""):
+    """Paths where two saved states differ."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        diffs = []
+        for key in sorted(set(expected) | set(actual), key=str):
+            diffs += diff_states(expected.get(key), actual.get(key), f"{prefix}{key}.")
+        return diffs
+    return [] if expected == actual else [f"{prefix.rstrip('.')}: {expected!r} -> {actual!r}"]
+
+
+def replay(path, csv_path=None, fixed_dt_ms=None):
+    """Runs the log in this process. Returns (final economy state or None, frame timings, player)."""
+    from main import Game
+    from profiler import PHASES
+
+    player = InputPlayer(path, fixed_dt_ms)
+    player.restore_files(os.environ["LEAFY_LOOT_SAVE_DIR"])
+    game = Game()
+    game.player = player
+    game.mouse_pos = tuple(player.header["mouse_pos"])
+    # Recording turns the profiler on; its window is sized to hold every frame
+    game.profiler.toggle_recording(csv_path)
+    game.profiler.frames = deque(maxlen=len(player.frames))
+    game.profiler.end_frame()
+
+    try:
+        while not player.done:
+            game.step()
+        game.quit_game()  # Recordings cut short without a QUIT
+    except SystemExit:
+        pass
+    state = game.game_mgr.economy.get_save_data() if game.game_mgr else None
+    busy = PHASES.index("wait") + 1
+    timings = [(row[0] - row[busy]) * 1000 for row in game.profiler.frames]
+    return state, timings, player
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded session headlessly and time every frame.")
+    parser.add_argument("log", help="log written by main.py --record")
+    parser.add_argument("--csv", help="also write per-phase frame timings (ms) here")
+    parser.add_argument("--dt", type=float, help="fixed ms per frame instead of the recorded ones")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as save_dir:
+        os.environ.update(SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", LEAFY_LOOT_SAVE_DIR=save_dir)
+        start = time.perf_counter()
+        state, timings, player = replay(os.path.abspath(args.log), args.csv and os.path.abspath(args.csv), args.dt)
+        wall = time.perf_counter() - start
+
+    if not timings:
+        # A recording that quit on its first frame has no frames to time; the end state is still compared
+        print("no frames recorded")
+    else:
+        print_timings(timings, wall)
+    if args.csv:
+        print(f"frame timings: {args.csv}")
+
+    if args.dt is not None:
+        print("fixed dt: final state not compared")
+        return 0
+    diffs = diff_states(player.end_state, state)
+    for line in diffs:
+        print(f"MISMATCH {line}")
+    if diffs:
+        return 1
+    print("final state matches the recording")
+    return 0
+
+
+def print_timings(timings, wall):
+    ordered = sorted(timings)
+    last = len(ordered) - 1
+    p50, p95, p99 = (ordered[min(last, round(p / 100 * last))] for p in (50, 95, 99))
+    print(f"{len(timings)} frames in {wall:.2f} s; busy ms p50 {p50:.2f}, p95 {p95:.2f}, p99 {p99:.2f}, "
+          f"max {ordered[-1]:.2f}")
+    slowest = sorted(range(len(timings)), key=timings.__getitem__, reverse=True)[:SLOWEST_SHOWN]
+    print("slowest frames: " + ", ".join(f"#{i} {timings[i]:.2f} ms" for i in slowest))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Save file format. Imports nothing from pygame.
+
+A save is a fixed header followed by zlib-compressed JSON:
+
+    magic  4 bytes  b"LEAF"
+    version  uint16  SAVE_VERSION the file was written with
+    length   uint32  size of the uncompressed payload
+    crc32    uint32  checksum of the uncompressed payload
+
+Files starting with "{" are old plain JSON saves and are still read.
+
+Between snapshots, economy events are appended to a journal file: one
+compact JSON record per line, after a header line naming the snapshot
+generation they apply to. A journal whose generation does not match the
+snapshot is stale and ignored.
+"""
+import json
+import os
+import struct
+import zlib
+
+SAVE_MAGIC = b"LEAF"
+SAVE_VERSION = 1
+HEADER = struct.Struct(">4sHII")
+
+
+class SaveFormatError(ValueError):
+    """The file is not a save this version can read."""
+
+
+def encode_save(data):
+    payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    header = HEADER.pack(SAVE_MAGIC, SAVE_VERSION, len(payload), zlib.crc32(payload))
+    return header + zlib.compress(payload, 6)
+
+
+def decode_save(blob):
+    if blob.lstrip()[:1] == b"{":
+        return json.loads(blob.decode("utf-8"))
+
+    if len(blob) < HEADER.size:
+        raise SaveFormatError("file is too short to be a save")
+    magic, version, length, crc = HEADER.unpack_from(blob)
+    if magic != SAVE_MAGIC:
+        raise SaveFormatError("not a Leafy Loot save")
+    if version > SAVE_VERSION:
+        raise SaveFormatError(f"save version {version} is newer than this game ({SAVE_VERSION})")
+
+    try:
+        payload = zlib.decompress(blob[HEADER.size:])
+    except zlib.error as e:
+        raise SaveFormatError(f"save data is damaged ({e})")
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        raise SaveFormatError("save data is damaged (checksum mismatch)")
+    return json.loads(payload.decode("utf-8"))
+
+
+def read_save(path):
+    with open(path, "rb") as f:
+        return decode_save(f.read())
+
+
+def write_save(path, data):
+    """Writes to a temp file, fsyncs and renames over `path`, so a crash never leaves half a save."""
+    write_atomic(path, encode_save(data))
+
+
+def write_atomic(path, blob):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+# --- JOURNAL ---
+def reset_journal(path, gen):
+    write_atomic(path, json.dumps({"gen": gen}).encode("utf-8") + b"\n")
+
+
+def append_journal(path, records):
+    lines = b"".join(json.dumps(r, separators=(",", ":")).encode("utf-8") + b"\n" for r in records)
+    with open(path, "ab") as f:
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_journal(path, gen):
+    """Records written after snapshot `gen`. A torn last line from a crash is dropped."""
+    if gen is None or not os.path.exists(path):
+        return []
+    with open(path, "rb") as f:
+        lines = f.read().split(b"\n")
+
+    try:
+        if json.loads(lines[0]).get("gen") != gen:
+            return []
+    except ValueError:
+        return []
+
+    records = []
+    for line in lines[1:]:
+        if not line:
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            break
+    return records
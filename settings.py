@@ -4,6 +4,17 @@ import sys
 # Screen
 WIDTH, HEIGHT = 900, 600
 FPS = 60
+BACKGROUND_FPS = 5  # Frame rate cap while the window is unfocused or minimized
+MINIMIZED_WAIT_MS = 1000  # Longest a minimized window sleeps between frames
+STATIC_SCREEN_WAIT_MS = 1000  # Longest the menu screens sleep waiting for input
+DIRTY_RECT_RENDERING = True  # Redraw and push only the screen regions that changed
+TEXT_CACHE_SIZE = 256  # Rendered text surfaces kept by fonts.text_cache
+PROFILER_HISTORY = 600  # Frames in the profiler's rolling window (F3 overlay, F4 CSV)
+PROFILER_BUCKETS_MS = [4, 8, 12, 17, 25, 33, 50, 100]  # Upper edges of the frame time histogram buckets
+# Bytes of decoded images AssetManager keeps: three season backgrounds (this, next and the one after near a
+# season's end) and the menu one, ~2.1 MB each at 32 bpp, plus 2 MB for icons and plant textures
+ASSET_MEMORY_BUDGET = 4 * WIDTH * HEIGHT * 4 + 2 * 1024 * 1024
+ASSET_CACHE_SAVE_DELAY = 5  # Idle seconds before the asset worker writes new images to the cache file
 
 # --- CRITICAL PATH FIX FOR EXE ---
 if getattr(sys, 'frozen', False):
@@ -14,8 +25,15 @@ else:
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
-SAVE_FILE = os.path.join(os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else BASE_DIR, "savegame.json")
-SETTINGS_FILE = os.path.join(os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else BASE_DIR, "settings.json")
+CATALOG_FILE = os.path.join(BASE_DIR, "catalog.json")  # Shop plants and upgrades, see catalog.py
+SAVE_DIR = os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else BASE_DIR
+# Saves, settings and caches go elsewhere when this is set (bench.py points it at a temp dir)
+SAVE_DIR = os.environ.get("LEAFY_LOOT_SAVE_DIR") or SAVE_DIR
+SAVE_FILE = os.path.join(SAVE_DIR, "savegame.dat")
+LEGACY_SAVE_FILE = os.path.join(SAVE_DIR, "savegame.json")  # Plain JSON saves from before savegame.dat
+JOURNAL_FILE = os.path.join(SAVE_DIR, "savegame.journal")  # Events since the last savegame.dat snapshot
+ASSET_CACHE_FILE = os.path.join(SAVE_DIR, "assets.cache")  # Pre-scaled images, see assetcache.py
+SETTINGS_FILE = os.path.join(SAVE_DIR, "settings.json")
 
 # Colors
 BG_COLOR = (30, 40, 30)
@@ -32,4 +50,32 @@ PLANTING_AREA_COLOR = (20, 40, 20)
 GAME_UI_BG = (40, 50, 40)
 
 # Game Constants
-SEASON_DURATION = 3 * 60  # seconds
\ No newline at end of file
+SEASON_DURATION = 3 * 60  # seconds
+
+# Seasons cycle in this order; each one scales leaf production
+SEASONS = ["Spring", "Summer", "Fall", "Winter"]
+SEASON_MULTIPLIERS = {"Spring": 1.3, "Summer": 1.1, "Fall": 1.0, "Winter": 0.7}
+
+# How many of the newest plants keep their purchase order (the widest sprite zoom shows a 20x20 grid)
+PLANT_RECENT_LIMIT = 400
+
+# Mixer channels: the first MUSIC_CHANNELS crossfade music, then SFX_VOICES per sound effect category.
+# A sound effect asked for again within its category's cooldown (seconds) is dropped.
+MUSIC_CHANNELS = 2
+SFX_VOICES = {"hover": 2, "ui": 4}
+SFX_COOLDOWNS = {"hover": 0.08, "ui": 0.03}
+
+# Decode the next season's music and build its backgrounds this long before the season ends
+SEASON_PREFETCH_SECONDS = 20
+
+# Shop bulk buy modes, cycled in order (None buys as many as affordable)
+BULK_MODES = [1, 10, 100, None]
+
+# Journal events AUTOSAVE_DEBOUNCE seconds after the last purchase, at most AUTOSAVE_INTERVAL apart
+AUTOSAVE_INTERVAL = 30
+AUTOSAVE_DEBOUNCE = 2
+# Rewrite the full snapshot once the journal holds this many events
+JOURNAL_COMPACT_EVERY = 200
+
+# Offline progress shorter than this is credited silently (no welcome back screen)
+OFFLINE_SUMMARY_MIN_SECONDS = 60
\ No newline at end of file
@@ -1,4 +1,5 @@
 import pygame
+from fonts import get_font, render_text
 from settings import BUTTON_COLOR, BUTTON_HOVER_COLOR, BUTTON_TEXT_COLOR, SLIDER_BG_COLOR, SLIDER_COLOR, SLIDER_HANDLE_COLOR
 
 
@@ -11,7 +12,7 @@ class Button:
 
         self.hovered = False
         self.was_hovered = False  # For sound trigger
-        self.font = pygame.font.Font(None, font_size)
+        self.font = get_font(font_size)
 
     def draw(self, surface):
         self.draw_with_offset(surface, 0)
@@ -25,27 +26,48 @@ class Button:
         pygame.draw.rect(surface, color, offset_rect, border_radius=border_radius)
         pygame.draw.rect(surface, (200, 200, 200), offset_rect, 2, border_radius=border_radius)
 
-        text_surf = self.font.render(self.text, True, BUTTON_TEXT_COLOR)
+        text_surf = render_text(self.font, self.text, BUTTON_TEXT_COLOR)
         text_rect = text_surf.get_rect(center=offset_rect.center)
         surface.blit(text_surf, text_rect)
 
-    def update(self, mouse_pos, sound_mgr, y_offset=0):
-        # Returns True if sound should be played. mouse_pos is screen coords.
+    def set_hovered(self, hovered, sound_mgr):
+        # Play hover sound only when the cursor enters the rect
         self.was_hovered = self.hovered
-        offset_rect = self.rect.move(0, -y_offset)
-        self.hovered = offset_rect.collidepoint(mouse_pos)
-
-        # Play hover sound only on the frame we enter the rect
+        self.hovered = hovered
         if self.hovered and not self.was_hovered:
             sound_mgr.play("hover")
 
-    def handle_click(self, sound_mgr, y_offset=0):
-        # Use the offset rect for click detection
-        offset_rect = self.rect.move(0, -y_offset)
-        if offset_rect.collidepoint(pygame.mouse.get_pos()):
-            sound_type = "back" if self.is_back else "select"
-            sound_mgr.play(sound_type)
-            return self.action_id
+    def click(self, sound_mgr):
+        sound_type = "back" if self.is_back else "select"
+        sound_mgr.play(sound_type)
+        return self.action_id
+
+
+class HitGrid:
+    """Spatial index for hit-testing widgets: a coarse grid whose cells list the widgets overlapping them.
+
+    hit() only looks at the few rects in the cell under the point, so its cost
+    does not grow with the number of widgets on screen.
+    """
+
+    CELL = 64
+
+    def __init__(self, widgets=()):
+        self.cells = {}
+        for widget in widgets:
+            self.add(widget.rect, widget)
+
+    def add(self, rect, target):
+        cell = self.CELL
+        for cx in range(rect.left // cell, (rect.right - 1) // cell + 1):
+            for cy in range(rect.top // cell, (rect.bottom - 1) // cell + 1):
+                self.cells.setdefault((cx, cy), []).append((rect, target))
+
+    def hit(self, pos):
+        """The most recently added target whose rect contains `pos`, or None."""
+        for rect, target in reversed(self.cells.get((pos[0] // self.CELL, pos[1] // self.CELL), ())):
+            if rect.collidepoint(pos):
+                return target
         return None
 
 
@@ -87,4 +109,103 @@ class Slider:
 
     def update_val(self, x):
         x = max(self.rect.left, min(self.rect.right, x))
-        self.value = (x - self.rect.left) / self.rect.width
\ No newline at end of file
+        self.value = (x - self.rect.left) / self.rect.width
+
+
+class VirtualList:
+    """Scrollable list of fixed-pitch rows that only materializes the rows in view.
+
+    Rows on screen plus OVERSCAN on either side each hold a surface; a row
+    scrolling out hands its surface to one scrolling in, and a row is redrawn
+    only when its key changes or it lands on a recycled surface. Layout and
+    scrollbar geometry are cached, so the list costs the same to draw, scroll
+    and hit-test with ten rows or ten thousand.
+
+    `draw_row(surface, index, key)` paints one row onto a cleared surface.
+    """
+
+    OVERSCAN = 1
+
+    def __init__(self, rect, row_h, pitch, track_rect, draw_row, bg_color):
+        self.rect = pygame.Rect(rect)
+        self.row_h = row_h
+        self.pitch = pitch
+        self.track_rect = pygame.Rect(track_rect)
+        self.draw_row = draw_row
+        self.bg_color = bg_color
+
+        self.count = 0
+        self.max_scroll = 0
+        self.thumb_h = 0
+        self.thumb_cache = (None, None)  # (scroll, thumb rect)
+        self.rows = {}  # Row index -> [surface, key]
+        self.pool = []
+
+    def reset(self, count):
+        """Starts over with `count` rows; every row is redrawn before it shows again."""
+        self.count = count
+        content_h = count * self.pitch
+        self.max_scroll = max(0, content_h - self.rect.height)
+        self.thumb_h = max(20, int(self.rect.height * (self.rect.height / content_h))) if self.max_scroll else 0
+        self.thumb_cache = (None, None)
+        self.pool.extend(surf for surf, _ in self.rows.values())
+        self.rows = {}
+
+    def get_visible_range(self, scroll):
+        """Indices [first, last) of the rows that are on screen or within the overscan."""
+        scroll = int(scroll)
+        first = max(0, scroll // self.pitch - self.OVERSCAN)
+        last = min(self.count, (scroll + self.rect.height) // self.pitch + 1 + self.OVERSCAN)
+        return first, last
+
+    def get_thumb_rect(self, scroll):
+        """The scrollbar thumb at `scroll`, or None when everything fits."""
+        if not self.max_scroll:
+            return None
+        scroll = int(scroll)
+        if self.thumb_cache[0] != scroll:
+            track_space = self.track_rect.height - self.thumb_h
+            top = self.track_rect.top + int((scroll / self.max_scroll) * track_space)
+            self.thumb_cache = (scroll, pygame.Rect(self.track_rect.x, top, self.track_rect.width, self.thumb_h))
+        return self.thumb_cache[1]
+
+    def row_at(self, pos, scroll):
+        """Index of the row under `pos`, or None. One division, whatever the length."""
+        if not self.rect.collidepoint(pos):
+            return None
+        row, inside = divmod(pos[1] - self.rect.top + int(scroll), self.pitch)
+        if inside >= self.row_h or row >= self.count:
+            return None
+        return row
+
+    def draw(self, screen, scroll, get_key):
+        """Blits the rows in view; `get_key(index)` says what a row shows and is only asked for those rows."""
+        scroll = int(scroll)
+        first, last = self.get_visible_range(scroll)
+        for index in [i for i in self.rows if not first <= i < last]:
+            self.pool.append(self.rows.pop(index)[0])
+
+        batch = []
+        for index in range(first, last):
+            key = get_key(index)
+            row = self.rows.get(index)
+            if row is None:
+                surf = self.pool.pop() if self.pool else pygame.Surface((self.rect.width, self.row_h))
+                row = self.rows[index] = [surf, None]
+            if row[1] != key:
+                row[0].fill(self.bg_color)
+                self.draw_row(row[0], index, key)
+                row[1] = key
+            batch.append((row[0], (self.rect.x, self.rect.y + index * self.pitch - scroll)))
+
+        # Inside whatever clip the caller set (the dirty region being redrawn)
+        clip = screen.get_clip()
+        screen.set_clip(self.rect.clip(clip))
+        screen.blits(batch, doreturn=False)
+        screen.set_clip(clip)
+
+        thumb_rect = self.get_thumb_rect(scroll)
+        if thumb_rect:
+            pygame.draw.rect(screen, (80, 80, 90), self.track_rect, border_radius=6)
+            pygame.draw.rect(screen, (160, 160, 160), thumb_rect, border_radius=6)
+            pygame.draw.rect(screen, (220, 220, 220), thumb_rect, 2, border_radius=6)
\ No newline at end of file